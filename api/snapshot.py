@@ -4,16 +4,22 @@ Vercel API entrypoint for options-chain snapshot data.
 This endpoint reuses the existing application logic from web.server.main.
 """
 
-from fastapi import FastAPI
+from typing import Annotated
 
-from web.server.main import get_snapshot
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
 
-app = FastAPI(title="options-chain Snapshot API")
+from web.server.main import MAX_SPREAD_TOP_K, OrjsonResponse, get_snapshot
+
+app = FastAPI(title="options-chain Snapshot API", default_response_class=OrjsonResponse)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 
 @app.get("/")
 @app.get("/api/snapshot")
-def snapshot(
+async def snapshot(
+    request: Request,
+    response: Response,
     mark_last_min: int | None = None,
     dte: int = 0,
     symbol: str = "SPX",
@@ -21,9 +27,12 @@ def snapshot(
     expiry_slot: str | None = None,
     strike_depth: str | None = None,
     include_skew: bool = False,
+    top_k: Annotated[int | None, Query(ge=1, le=MAX_SPREAD_TOP_K)] = None,
 ):
     """Return snapshot with optional symbol/expiry selectors and mark-last delta window."""
-    return get_snapshot(
+    return await get_snapshot(
+        request,
+        response,
         mark_last_min=mark_last_min,
         dte=dte,
         symbol=symbol,
@@ -31,4 +40,5 @@ def snapshot(
         expiry_slot=expiry_slot,
         strike_depth=strike_depth,
         include_skew=include_skew,
+        top_k=top_k,
     )
@@ -1,32 +1,19 @@
 import argparse
 import os
-import subprocess
 import sys
+from functools import lru_cache
 
 from config import get_api_secret, get_account_id
 
-try:
-    from public_api_sdk import (
-        PublicApiClient,
-        PublicApiClientConfiguration,
-        OrderInstrument,
-        InstrumentType,
-        OptionChainRequest,
-        OptionExpirationsRequest,
-    )
-    from public_api_sdk.auth_config import ApiKeyAuthConfig
-except ImportError:
-    print("Installing required dependency: publicdotcom-py...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "publicdotcom-py==0.1.8"])
-    from public_api_sdk import (
-        PublicApiClient,
-        PublicApiClientConfiguration,
-        OrderInstrument,
-        InstrumentType,
-        OptionChainRequest,
-        OptionExpirationsRequest,
-    )
-    from public_api_sdk.auth_config import ApiKeyAuthConfig
+from public_api_sdk import (
+    PublicApiClient,
+    PublicApiClientConfiguration,
+    OrderInstrument,
+    InstrumentType,
+    OptionChainRequest,
+    OptionExpirationsRequest,
+)
+from public_api_sdk.auth_config import ApiKeyAuthConfig
 
 
 # Index symbols use InstrumentType.INDEX (SPX, NDX, VIX, etc.)
@@ -95,6 +82,7 @@ def list_expirations(symbol, account_id=None, index=False):
         sys.exit(1)
 
 
+@lru_cache(maxsize=8192)
 def parse_osi_symbol(osi_symbol):
     """
     Parse an OSI option symbol to extract strike price.
@@ -5,32 +5,21 @@ with mark and range until mark is >= threshold (default $0.20).
 Shows both call side and put side.
 """
 import argparse
-import subprocess
 import sys
 from datetime import date
 
+import numpy as np
+
 from config import get_api_secret, get_account_id
 
-try:
-    from public_api_sdk import (
-        PublicApiClient,
-        PublicApiClientConfiguration,
-        OrderInstrument,
-        InstrumentType,
-        OptionChainRequest,
-    )
-    from public_api_sdk.auth_config import ApiKeyAuthConfig
-except ImportError:
-    print("Installing required dependency: publicdotcom-py...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "publicdotcom-py==0.1.8"])
-    from public_api_sdk import (
-        PublicApiClient,
-        PublicApiClientConfiguration,
-        OrderInstrument,
-        InstrumentType,
-        OptionChainRequest,
-    )
-    from public_api_sdk.auth_config import ApiKeyAuthConfig
+from public_api_sdk import (
+    PublicApiClient,
+    PublicApiClientConfiguration,
+    OrderInstrument,
+    InstrumentType,
+    OptionChainRequest,
+)
+from public_api_sdk.auth_config import ApiKeyAuthConfig
 
 from get_option_chain import get_option_expirations, parse_osi_symbol
 
@@ -79,7 +68,7 @@ def _fetch_chain(client, expiration_date):
 
 
 def _build_strike_map(option_list):
-    """Return dict strike -> (bid, ask). Strikes as float for sorting."""
+    """Return (strikes, bids, asks) float arrays sorted by ascending strike; missing quotes are NaN."""
     out = {}
     for opt in option_list:
         osi = opt.instrument.symbol if hasattr(opt, "instrument") else None
@@ -91,7 +80,10 @@ def _build_strike_map(option_list):
         bid = getattr(opt, "bid", None)
         ask = getattr(opt, "ask", None)
         out[strike] = (bid, ask)
-    return out
+    strikes = sorted(out)
+    bids = [_float_or_nan(out[k][0]) for k in strikes]
+    asks = [_float_or_nan(out[k][1]) for k in strikes]
+    return np.array(strikes, dtype=float), np.array(bids, dtype=float), np.array(asks, dtype=float)
 
 
 def _float_or_none(x):
@@ -103,6 +95,26 @@ def _float_or_none(x):
         return None
 
 
+def _float_or_nan(x):
+    value = _float_or_none(x)
+    return np.nan if value is None else value
+
+
+def _spread_ladder(strikes, bids, asks, mark_above):
+    """
+    Adjacent spreads short=strikes[i], long=strikes[i+1] along the given strike order, cut at the
+    first spread whose mark drops below mark_above. Returns (short, long, mark, range_min, range_max).
+    Spreads with a missing quote have NaN mark/range and never stop the ladder.
+    """
+    mids = (bids + asks) / 2
+    mark = mids[:-1] - mids[1:]
+    range_min = bids[:-1] - asks[1:]
+    range_max = asks[:-1] - bids[1:]
+    below = mark < mark_above
+    stop = int(np.argmax(below)) if below.any() else len(mark)
+    return strikes[:-1][:stop], strikes[1:][:stop], mark[:stop], range_min[:stop], range_max[:stop]
+
+
 def run(mark_above=0.20):
     secret = get_api_secret()
     account_id = get_account_id()
@@ -134,43 +146,23 @@ def run(mark_above=0.20):
             sys.exit(1)
 
         calls, puts = _fetch_chain(client, expiration_date)
-        call_map = _build_strike_map(calls)
-        put_map = _build_strike_map(puts)
+        call_strikes, call_bids, call_asks = _build_strike_map(calls)
+        put_strikes, put_bids, put_asks = _build_strike_map(puts)
 
-        def print_side(title, strike_map, strikes_sorted, start_idx, pair_order_ascending):
-            """Print spreads until mark >= mark_above. pair_order_ascending: (short, long) order in strikes_sorted."""
+        def print_side(title, strikes, bids, asks):
+            """Print spreads (short=strikes[i], long=strikes[i+1]) until mark drops below mark_above."""
             print(f"\n{title}")
             print(f"  {'Spread':<14} {'Mark':>10}   {'Range':<20}")
             print(f"  {'-'*14} {'-'*10}   {'-'*20}")
-            for i in range(start_idx, len(strikes_sorted) - 1):
-                k_first = strikes_sorted[i]
-                k_second = strikes_sorted[i + 1]
-                if pair_order_ascending:
-                    k_short, k_long = k_first, k_second
-                else:
-                    k_short, k_long = k_second, k_first  # put: short is higher strike
+            ladder = _spread_ladder(strikes, bids, asks, mark_above)
+            for k_short, k_long, mark, r_min, r_max in zip(*(col.tolist() for col in ladder)):
                 spread_label = f"{int(k_short)}/{int(k_long)}"
-                bid_short, ask_short = strike_map.get(k_short, (None, None))
-                bid_long, ask_long = strike_map.get(k_long, (None, None))
-                b_s = _float_or_none(bid_short)
-                a_s = _float_or_none(ask_short)
-                b_l = _float_or_none(bid_long)
-                a_l = _float_or_none(ask_long)
-                if None in (b_s, a_s, b_l, a_l):
+                if np.isnan(mark):
                     mark_str = "--"
                     range_str = "--"
-                    mark_val = None
                 else:
-                    mid_short = (b_s + a_s) / 2
-                    mid_long = (b_l + a_l) / 2
-                    mark = mid_short - mid_long
-                    r_min = b_s - a_l
-                    r_max = a_s - b_l
                     mark_str = f"${mark:.2f}"
                     range_str = f"${r_min:.2f} – ${r_max:.2f}"
-                    mark_val = mark
-                if mark_val is not None and mark_val < mark_above:
-                    return  # stop when mark drops below threshold
                 print(f"  {spread_label:<14} {mark_str:>10}   {range_str:<20}")
 
         print("=" * 60)
@@ -178,25 +170,32 @@ def run(mark_above=0.20):
         print(f"SPX now: {spx_now:,.2f}")
         print("=" * 60)
 
-        if call_map:
-            strikes_asc = sorted(call_map.keys())
-            start_call = 0
-            for i, k in enumerate(strikes_asc):
-                if k >= spx_now:
-                    start_call = i
-                    break
-            print_side("CALL credit spreads (short/low strike, long/high strike)", call_map, strikes_asc, start_call, True)
+        if len(call_strikes):
+            # Short the first strike at/above spot, long the next higher one.
+            start_call = int(np.searchsorted(call_strikes, spx_now, side="left"))
+            if start_call == len(call_strikes):
+                start_call = 0
+            print_side(
+                "CALL credit spreads (short/low strike, long/high strike)",
+                call_strikes[start_call:],
+                call_bids[start_call:],
+                call_asks[start_call:],
+            )
         else:
             print("\nCALL credit spreads: No call options in chain.")
 
-        if put_map:
-            strikes_desc = sorted(put_map.keys(), reverse=True)
-            start_put = 0
-            for i, k in enumerate(strikes_desc):
-                if k <= spx_now:
-                    start_put = i
-                    break
-            print_side("PUT credit spreads (short/high strike, long/low strike)", put_map, strikes_desc, start_put, True)
+        if len(put_strikes):
+            # Walk strikes downward: short the first strike at/below spot, long the next lower one.
+            strikes_desc = put_strikes[::-1]
+            start_put = len(put_strikes) - int(np.searchsorted(put_strikes, spx_now, side="right"))
+            if start_put == len(put_strikes):
+                start_put = 0
+            print_side(
+                "PUT credit spreads (short/high strike, long/low strike)",
+                strikes_desc[start_put:],
+                put_bids[::-1][start_put:],
+                put_asks[::-1][start_put:],
+            )
         else:
             print("\nPUT credit spreads: No put options in chain.")
 
@@ -15,6 +15,7 @@ import urllib.error
 import urllib.parse
 import urllib.request
 from datetime import date, datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
 try:
@@ -114,6 +115,7 @@ def _norm_exp(exp):
     return str(exp)
 
 
+@lru_cache(maxsize=8192)
 def parse_osi_symbol(osi_symbol):
     """Parse OSI symbol strike from trailing 8 digits (strike * 1000)."""
     try:
@@ -4,34 +4,23 @@ SPX option chain volume leaders: top volume now, or top volume in last 5 minutes
 Uses SPX today's expiration (same-day if available, else nearest).
 """
 import argparse
-import subprocess
+import asyncio
+import heapq
 import sys
 from datetime import date
+from operator import attrgetter
 
 from config import get_api_secret, get_account_id
 
-try:
-    from public_api_sdk import (
-        PublicApiClient,
-        PublicApiClientConfiguration,
-        OrderInstrument,
-        InstrumentType,
-        OptionChainRequest,
-        OptionExpirationsRequest,
-    )
-    from public_api_sdk.auth_config import ApiKeyAuthConfig
-except ImportError:
-    print("Installing required dependency: publicdotcom-py...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "publicdotcom-py==0.1.8"])
-    from public_api_sdk import (
-        PublicApiClient,
-        PublicApiClientConfiguration,
-        OrderInstrument,
-        InstrumentType,
-        OptionChainRequest,
-        OptionExpirationsRequest,
-    )
-    from public_api_sdk.auth_config import ApiKeyAuthConfig
+from public_api_sdk import (
+    PublicApiClient,
+    PublicApiClientConfiguration,
+    OrderInstrument,
+    InstrumentType,
+    OptionChainRequest,
+    OptionExpirationsRequest,
+)
+from public_api_sdk.auth_config import ApiKeyAuthConfig
 
 from get_option_chain import get_option_expirations, parse_osi_symbol
 
@@ -43,6 +32,9 @@ COLOR_RESET = "\033[0m"
 
 SYMBOL = "SPX"
 
+_option_osi = attrgetter("instrument.symbol")
+_option_row_fields = attrgetter("volume", "bid", "ask")
+
 
 def _norm_exp(exp):
     """Normalize expiration to YYYY-MM-DD string."""
@@ -81,11 +73,9 @@ def _build_rows(calls, puts):
 
     def add(opt_list, side):
         for opt in opt_list:
-            osi = opt.instrument.symbol if hasattr(opt, "instrument") else "N/A"
+            osi = _option_osi(opt) if hasattr(opt, "instrument") else "N/A"
             strike = parse_osi_symbol(osi)
-            volume = getattr(opt, "volume", None)
-            bid = getattr(opt, "bid", None)
-            ask = getattr(opt, "ask", None)
+            volume, bid, ask = _option_row_fields(opt)
             rows.append((osi, side, strike, volume, bid, ask))
 
     add(calls, "CALL")
@@ -95,13 +85,12 @@ def _build_rows(calls, puts):
 
 def _print_table(rows, expiration_date, title_suffix, volume_key="volume", top=20):
     """Print top N rows as table. volume_key is 'volume' or 'delta' for column label."""
-    # Sort by volume/delta desc (treat None as 0)
-    sorted_rows = sorted(
+    # Top N by volume/delta desc (treat None as 0); same order as a full sort, without sorting every row
+    top_rows = heapq.nlargest(
+        top,
         rows,
         key=lambda r: (r[3] or 0) if isinstance(r[3], (int, float)) else 0,
-        reverse=True,
     )
-    top_rows = sorted_rows[:top]
 
     print("=" * 70)
     print(f"SPX volume leaders (expiration: {expiration_date}) — {title_suffix}")
@@ -136,9 +125,9 @@ def run_top_now(client, expiration_date, is_today, top):
     _print_table(rows, expiration_date, "top volume now", volume_key="volume", top=top)
 
 
-def run_last_5_min(client, expiration_date, is_today, top):
+async def run_last_5_min(client, expiration_date, is_today, top):
     """Fetch, store snapshot, wait 5 min, fetch again, rank by delta, print top N."""
-    calls, puts = _fetch_chain(client, expiration_date)
+    calls, puts = await asyncio.to_thread(_fetch_chain, client, expiration_date)
     rows = _build_rows(calls, puts)
     if not rows:
         print("No option data in chain.")
@@ -146,10 +135,9 @@ def run_last_5_min(client, expiration_date, is_today, top):
     snapshot = {r[0]: (r[3] or 0) for r in rows}
 
     print("Waiting 5 minutes...")
-    import time
-    time.sleep(300)
+    await asyncio.sleep(300)
 
-    calls2, puts2 = _fetch_chain(client, expiration_date)
+    calls2, puts2 = await asyncio.to_thread(_fetch_chain, client, expiration_date)
     rows2 = _build_rows(calls2, puts2)
     # Build (osi, side, strike, delta, bid, ask) using current volume - snapshot
     delta_rows = []
@@ -206,7 +194,7 @@ def main():
                 sys.exit(1)
 
         if args.last_5_min:
-            run_last_5_min(client, expiration_date, is_today, args.top)
+            asyncio.run(run_last_5_min(client, expiration_date, is_today, args.top))
         else:
             run_top_now(client, expiration_date, is_today, args.top)
 
@@ -1,5 +1,10 @@
+import asyncio
 import unittest
 from datetime import date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
 
 import web.server.main as server_main
 
@@ -140,7 +145,7 @@ class SnapshotAtrFlagTests(unittest.TestCase):
     def test_get_snapshot_disables_atr_by_default(self):
         calls = []
 
-        def fake_fetch_snapshot(**kwargs):
+        async def fake_fetch_snapshot(**kwargs):
             calls.append(kwargs)
             return {
                 "symbol": "SPX",
@@ -151,12 +156,111 @@ class SnapshotAtrFlagTests(unittest.TestCase):
 
         server_main._fetch_snapshot = fake_fetch_snapshot
 
-        server_main.get_snapshot()
+        asyncio.run(server_main.get_snapshot())
         self.assertFalse(calls[-1]["include_atr"])
 
-        server_main.get_snapshot(include_atr=True)
+        asyncio.run(server_main.get_snapshot(include_atr=True))
         self.assertTrue(calls[-1]["include_atr"])
 
 
+class _LadderClient:
+    """Call ladder above 5000 with steadily cheaper credits farther OTM."""
+
+    def __init__(self, strike_count=40):
+        self.strike_count = strike_count
+
+    def get_quotes(self, instruments):
+        return [SimpleNamespace(last=Decimal("5000"), high=None, low=None, close=Decimal("4990"))]
+
+    def get_option_expirations(self, request):
+        return SimpleNamespace(expirations=[date.today().isoformat()])
+
+    def get_option_chain(self, request):
+        exp = request.expiration_date.replace("-", "")[2:]
+        calls = []
+        for i in range(self.strike_count):
+            strike = 5005 + i * 5
+            mid = Decimal("1.00") + Decimal("0.05") * (self.strike_count - i)
+            calls.append(
+                SimpleNamespace(
+                    instrument=SimpleNamespace(symbol=f"SPXW{exp}C{strike * 1000:08d}"),
+                    open_interest=1,
+                    volume=1,
+                    bid=mid - Decimal("0.05"),
+                    ask=mid + Decimal("0.05"),
+                )
+            )
+        return SimpleNamespace(calls=calls, puts=[])
+
+    def get_option_greeks(self, osi_symbols):
+        return SimpleNamespace(greeks=[])
+
+
+class SnapshotTopKTests(unittest.TestCase):
+    _state = (
+        "_quote_cache_by_symbol",
+        "_chain_cache_by_symbol_exp",
+        "_greeks_cache_by_symbol_exp",
+        "_expiration_dates_cache_by_symbol",
+        "_expiration_targets_cache",
+        "_snapshot_buffers",
+        "_hot_strikes_cache",
+        "_snapshot_response_cache",
+        "_public_api_clients",
+    )
+
+    def setUp(self):
+        self.orig_state = {name: dict(getattr(server_main, name)) for name in self._state}
+        for name in self._state:
+            getattr(server_main, name).clear()
+        self.orig_compute_atr = server_main._compute_atr_analysis
+        server_main._compute_atr_analysis = lambda **kwargs: {
+            "status": "ok",
+            "plus_1atr_level": 5040.0,
+            "minus_1atr_level": None,
+            "plus_2atr_level": None,
+            "minus_2atr_level": None,
+        }
+        self._install_client(_LadderClient())
+
+    def _install_client(self, client):
+        key = (server_main.get_api_secret(), server_main.get_account_id())
+        server_main._public_api_clients[key] = client
+
+    def tearDown(self):
+        server_main._compute_atr_analysis = self.orig_compute_atr
+        for name, saved in self.orig_state.items():
+            getattr(server_main, name).clear()
+            getattr(server_main, name).update(saved)
+
+    def test_top_k_trims_response_but_atr_targets_use_full_ladder(self):
+        full = asyncio.run(server_main._fetch_snapshot(symbol="SPX", include_atr=True))
+        trimmed = asyncio.run(server_main._fetch_snapshot(symbol="SPX", include_atr=True, top_k=5))
+
+        full_calls = full["spread_scanner"]["call_credit_spreads"]
+        trimmed_calls = trimmed["spread_scanner"]["call_credit_spreads"]
+        self.assertEqual(trimmed_calls, full_calls[:5])
+        self.assertGreater(len(full_calls), 5)
+        self.assertEqual(full["atr_target_spreads"]["call_plus_1atr"]["short_strike"], 5040.0)
+        self.assertEqual(trimmed["atr_target_spreads"]["call_plus_1atr"]["short_strike"], 5040.0)
+
+    def test_top_k_is_capped_at_max_rows(self):
+        self._install_client(_LadderClient(strike_count=server_main.MAX_SPREAD_TOP_K + 50))
+
+        full = asyncio.run(server_main._fetch_snapshot(symbol="SPX"))
+        capped = asyncio.run(server_main._fetch_snapshot(symbol="SPX", top_k=10_000))
+
+        self.assertGreater(len(full["spread_scanner"]["call_credit_spreads"]), server_main.MAX_SPREAD_TOP_K)
+        self.assertEqual(len(capped["spread_scanner"]["call_credit_spreads"]), server_main.MAX_SPREAD_TOP_K)
+
+    def test_out_of_range_top_k_is_rejected(self):
+        client = TestClient(server_main.app)
+        for value in (0, -3, server_main.MAX_SPREAD_TOP_K + 1):
+            self.assertEqual(client.get("/api/snapshot", params={"top_k": value}).status_code, 422, value)
+        with self.assertRaises(server_main.HTTPException) as ctx:
+            asyncio.run(server_main._fetch_snapshot(symbol="SPX", top_k=0))
+        self.assertEqual(ctx.exception.status_code, 400)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from datetime import date
 
-from web.server.main import _build_expiry_slots, _resolve_expiration_for_slot
+from web.server.main import _build_expiry_slots, _build_legacy_expiration_targets, _resolve_expiration_for_slot
 
 
 class ExpirySlotResolverTests(unittest.TestCase):
@@ -42,6 +42,24 @@ class ExpirySlotResolverTests(unittest.TestCase):
         self.assertEqual(slots["slot_next1"], "2026-03-06")
         self.assertIsNone(slots["slot_next2"])
 
+    def test_legacy_targets_pick_next_listing_and_friday(self):
+        today = date(2026, 3, 3)  # Tuesday
+        expiries = [date(2026, 3, 2), today, date(2026, 3, 4), date(2026, 3, 6), date(2026, 3, 13)]
+        targets = _build_legacy_expiration_targets(expiries, today=today)
+        self.assertEqual(targets, {"dte0": "2026-03-03", "dte1": "2026-03-04", "friday": "2026-03-06"})
+
+    def test_legacy_targets_on_friday_skip_same_day_friday(self):
+        today = date(2026, 3, 6)  # Friday
+        expiries = [today, date(2026, 3, 9), date(2026, 3, 13)]
+        targets = _build_legacy_expiration_targets(expiries, today=today)
+        self.assertEqual(targets, {"dte0": "2026-03-06", "dte1": "2026-03-09", "friday": "2026-03-13"})
+
+    def test_legacy_targets_fall_back_to_last_listing(self):
+        today = date(2026, 3, 10)
+        expiries = [date(2026, 3, 4), date(2026, 3, 6)]
+        targets = _build_legacy_expiration_targets(expiries, today=today)
+        self.assertEqual(targets, {"dte0": "2026-03-06", "dte1": "2026-03-06", "friday": "2026-03-06"})
+
 
 if __name__ == "__main__":
     unittest.main()
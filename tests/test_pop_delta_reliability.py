@@ -1,5 +1,6 @@
+import time
 import unittest
-from datetime import datetime, timedelta
+from datetime import datetime
 
 import web.server.main as server_main
 
@@ -56,7 +57,7 @@ class PopDeltaReliabilityTests(unittest.TestCase):
         server_main.GREEKS_FETCH_CHUNK_SIZE = 2
         cache_key = ("SPY", "2026-03-05")
         server_main._greeks_cache_by_symbol_exp[cache_key] = {
-            "fetched_at": now - timedelta(minutes=2),
+            "fetched_at": time.time() - 120,
             "by_osi": {
                 "C": {"delta": 0.33, "implied_volatility": 0.19},
             },
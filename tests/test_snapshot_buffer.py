@@ -0,0 +1,120 @@
+import unittest
+from collections import deque
+
+import web.server.main as server_main
+
+
+def _entry(epoch, ts_iso, put_vol, call_vol, strike=6000.0):
+    rows = [{"strike": strike, "put_vol": put_vol, "call_vol": call_vol}]
+    return server_main.VolumeSnapshot(epoch, ts_iso, *server_main._volume_snapshot(rows))
+
+
+class SnapshotBufferTests(unittest.TestCase):
+    def setUp(self):
+        self._orig_hot_cache = dict(server_main._hot_strikes_cache)
+        server_main._hot_strikes_cache.clear()
+
+    def tearDown(self):
+        server_main._hot_strikes_cache.clear()
+        server_main._hot_strikes_cache.update(self._orig_hot_cache)
+
+    def test_prune_buffer_drops_only_entries_older_than_max_age(self):
+        now_epoch = 1_800_000_000.0
+        max_age = server_main.SNAPSHOT_BUFFER_MAX_AGE_MINUTES * 60
+        buffer = deque(
+            [
+                _entry(now_epoch - max_age - 30, "old", 1, 1),
+                _entry(now_epoch - max_age + 30, "recent", 2, 2),
+                _entry(now_epoch, "now", 3, 3),
+            ]
+        )
+
+        server_main._prune_buffer(buffer, now_epoch)
+
+        self.assertEqual([item[1] for item in buffer], ["recent", "now"])
+
+    def test_record_volume_snapshot_skips_polls_closer_than_min_interval(self):
+        now_epoch = 1_800_000_000.0
+        interval = server_main.SNAPSHOT_BUFFER_MIN_INTERVAL_SECONDS
+        rows = [{"strike": 6000.0, "put_vol": 1, "call_vol": 2}]
+        buffer = deque()
+
+        server_main._record_volume_snapshot(buffer, now_epoch, "t0", rows)
+        server_main._record_volume_snapshot(buffer, now_epoch + interval - 1, "t1", rows)
+        server_main._record_volume_snapshot(buffer, now_epoch + interval, "t2", rows)
+
+        self.assertEqual([item.timestamp for item in buffer], ["t0", "t2"])
+        self.assertEqual(buffer[-1].put_vol.tolist(), [1])
+
+    def test_nearest_buffer_entry_prefers_older_on_ties_and_skips_excluded(self):
+        buffer = deque([_entry(100.0, "a", 0, 0), _entry(200.0, "b", 0, 0), _entry(300.0, "c", 0, 0)])
+
+        self.assertEqual(server_main._nearest_buffer_entry(buffer, 150.0)[1], "a")
+        self.assertEqual(server_main._nearest_buffer_entry(buffer, 160.0)[1], "b")
+        self.assertEqual(server_main._nearest_buffer_entry(buffer, 10.0)[1], "a")
+        self.assertEqual(server_main._nearest_buffer_entry(buffer, 900.0)[1], "c")
+        self.assertEqual(server_main._nearest_buffer_entry(buffer, 900.0, exclude_ts="c")[1], "b")
+        self.assertEqual(server_main._nearest_buffer_entry(buffer, 190.0, exclude_ts="b")[1], "a")
+        self.assertIsNone(server_main._nearest_buffer_entry(deque([_entry(1.0, "x", 0, 0)]), 1.0, exclude_ts="x"))
+
+    def test_hot_strikes_compare_against_snapshot_closest_to_target(self):
+        now_epoch = 1_800_000_000.0
+        buffer = deque(
+            [
+                _entry(now_epoch - 290, "ref-5m", put_vol=100, call_vol=50),
+                _entry(now_epoch - 60, "ref-1m", put_vol=140, call_vol=90),
+            ]
+        )
+        current_rows = [{"strike": 6000.0, "put_vol": 150, "call_vol": 80}]
+
+        hot_calls, hot_puts = server_main._compute_hot_strikes(
+            current_rows,
+            snapshot_buffer=buffer,
+            target_minutes=5,
+            now_epoch=now_epoch,
+        )
+
+        self.assertEqual(hot_calls[0]["delta_5m"], 30)
+        self.assertEqual(hot_puts[0]["delta_5m"], 50)
+        self.assertEqual(hot_puts[0]["snapshot_ref"], "ref-5m")
+
+    def test_hot_strikes_treat_strikes_missing_from_reference_as_zero(self):
+        now_epoch = 1_800_000_000.0
+        buffer = deque([_entry(now_epoch - 300, "ref", put_vol=10, call_vol=10, strike=6000.0)])
+        current_rows = [
+            {"strike": 5995.0, "put_vol": 7, "call_vol": None},
+            {"strike": 6000.0, "put_vol": 12, "call_vol": 10},
+        ]
+
+        hot_calls, hot_puts = server_main._compute_hot_strikes(
+            current_rows,
+            snapshot_buffer=buffer,
+            now_epoch=now_epoch,
+        )
+
+        self.assertEqual(hot_calls, [])
+        self.assertEqual([(row["strike"], row["delta_5m"]) for row in hot_puts], [(5995.0, 7), (6000.0, 2)])
+        self.assertIsInstance(hot_puts[0]["current_vol"], int)
+
+    def test_hot_strikes_reuse_cached_ranking_for_same_rows_and_reference(self):
+        now_epoch = 1_800_000_000.0
+        buffer = deque([_entry(now_epoch - 300, "ref", put_vol=10, call_vol=10)])
+        rows = [{"strike": 6000.0, "put_vol": 12, "call_vol": 15}]
+        cache_key = ("SPX", "2026-02-20", "chain-ts")
+
+        first = server_main._compute_hot_strikes(rows, snapshot_buffer=buffer, now_epoch=now_epoch, cache_key=cache_key)
+        changed_rows = [{"strike": 6000.0, "put_vol": 99, "call_vol": 99}]
+        cached = server_main._compute_hot_strikes(
+            changed_rows, snapshot_buffer=buffer, now_epoch=now_epoch, cache_key=cache_key
+        )
+        fresh = server_main._compute_hot_strikes(
+            changed_rows, snapshot_buffer=buffer, now_epoch=now_epoch, cache_key=("SPX", "2026-02-20", "next-ts")
+        )
+
+        self.assertEqual(cached, first)
+        self.assertEqual(first[0][0]["delta_5m"], 5)
+        self.assertEqual(fresh[0][0]["delta_5m"], 89)
+
+
+if __name__ == "__main__":
+    unittest.main()
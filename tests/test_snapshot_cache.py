@@ -0,0 +1,360 @@
+import asyncio
+import time
+import unittest
+from collections import deque
+
+from fastapi import Request, Response
+
+import web.server.main as server_main
+
+
+class SnapshotResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.orig_build_snapshot = server_main._build_snapshot
+        self.orig_response_cache = dict(server_main._snapshot_response_cache)
+        server_main._snapshot_response_cache.clear()
+        server_main._snapshot_fetch_locks.clear()
+        server_main._upstream_fetch_locks.clear()
+        self.orig_buffers = dict(server_main._snapshot_buffers)
+        server_main._snapshot_buffers.clear()
+
+    def tearDown(self):
+        server_main._snapshot_buffers.clear()
+        server_main._snapshot_buffers.update(self.orig_buffers)
+        server_main._build_snapshot = self.orig_build_snapshot
+        server_main._snapshot_response_cache.clear()
+        server_main._snapshot_response_cache.update(self.orig_response_cache)
+        server_main._snapshot_fetch_locks.clear()
+        server_main._upstream_fetch_locks.clear()
+
+    def _install_fake_build(self, calls):
+        async def fake_build_snapshot(**kwargs):
+            calls.append(kwargs)
+            await asyncio.sleep(0.01)
+            return {
+                "symbol": kwargs["symbol"],
+                "expiration": "2026-03-06",
+                "timestamp": "2026-03-06T12:00:00Z",
+                "strikes": [{"strike": 6000.0, "put_vol": 10, "call_vol": 20}],
+            }
+
+        server_main._build_snapshot = fake_build_snapshot
+
+    def test_concurrent_requests_for_same_key_share_one_fetch(self):
+        calls = []
+        self._install_fake_build(calls)
+
+        async def burst():
+            return await asyncio.gather(*[server_main._fetch_snapshot(symbol="spx") for _ in range(5)])
+
+        results = asyncio.run(burst())
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r["symbol"] == "SPX" for r in results))
+
+    def test_cached_strike_rows_are_copied_per_request(self):
+        calls = []
+        self._install_fake_build(calls)
+
+        first = asyncio.run(server_main._fetch_snapshot(symbol="SPX"))
+        first["strikes"][0]["delta_put"] = 5
+        second = asyncio.run(server_main._fetch_snapshot(symbol="SPX"))
+
+        self.assertEqual(len(calls), 1)
+        self.assertNotIn("delta_put", second["strikes"][0])
+
+    def test_distinct_request_keys_do_not_share_payloads(self):
+        calls = []
+        self._install_fake_build(calls)
+
+        asyncio.run(server_main._fetch_snapshot(symbol="SPX"))
+        asyncio.run(server_main._fetch_snapshot(symbol="SPX", include_skew=True))
+        asyncio.run(server_main._fetch_snapshot(symbol="NDX"))
+
+        self.assertEqual(len(calls), 3)
+
+    def test_slot_requests_ignore_dte_and_leave_no_locks_or_stale_entries(self):
+        calls = []
+        self._install_fake_build(calls)
+        server_main._snapshot_response_cache[("stale",)] = {"fetched_at": time.monotonic() - 60, "payload": {}}
+
+        for dte in range(2, 12):
+            asyncio.run(server_main._fetch_snapshot(symbol="SPX", dte=dte, expiry_mode="bogus", expiry_slot="0dte"))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(server_main._snapshot_response_cache), 1)
+        self.assertEqual(server_main._snapshot_fetch_locks, {})
+
+    def test_mark_last_min_deltas_are_attached_per_request(self):
+        calls = []
+        self._install_fake_build(calls)
+        now_epoch = server_main._as_utc(server_main._now_utc()).timestamp()
+        rows = [{"strike": 6000.0, "put_vol": 4, "call_vol": 5}]
+        server_main._snapshot_buffers[("SPX", "2026-03-06")] = deque(
+            [(now_epoch - 60, "ref", *server_main._volume_snapshot(rows))]
+        )
+
+        marked = asyncio.run(server_main._fetch_snapshot(symbol="SPX", mark_last_min=1))
+        plain = asyncio.run(server_main._fetch_snapshot(symbol="SPX"))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((marked["strikes"][0]["delta_put"], marked["strikes"][0]["delta_call"]), (6, 15))
+        self.assertNotIn("delta_put", plain["strikes"][0])
+
+    def test_snapshot_endpoint_returns_not_modified_for_matching_etag(self):
+        calls = []
+        self._install_fake_build(calls)
+
+        def request(headers=()):
+            return Request({"type": "http", "headers": [(k.encode(), v.encode()) for k, v in headers]})
+
+        first_response = Response()
+        payload = asyncio.run(server_main.get_snapshot(request(), first_response, symbol="SPX"))
+        etag = first_response.headers["etag"]
+        self.assertEqual(payload["symbol"], "SPX")
+        self.assertEqual(first_response.headers["cache-control"], "no-cache")
+
+        not_modified = asyncio.run(
+            server_main.get_snapshot(request([("if-none-match", etag)]), Response(), symbol="SPX")
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.headers["etag"], etag)
+
+        other_response = Response()
+        marked = asyncio.run(
+            server_main.get_snapshot(request([("if-none-match", etag)]), other_response, symbol="SPX", mark_last_min=5)
+        )
+        self.assertIsInstance(marked, dict)
+        self.assertNotEqual(other_response.headers["etag"], etag)
+
+    def test_snapshot_etag_tracks_greeks_and_reference_snapshots(self):
+        base = {
+            "symbol": "SPX",
+            "chain_timestamp": "c",
+            "quote_timestamp": "q",
+            "greeks_timestamp": "g1",
+            "hot_strikes_call": [{"strike": 6000.0, "snapshot_ref": "r1"}],
+            "hot_strikes_put": [],
+            "mark_reference_timestamp": "m1",
+        }
+        etag = server_main._snapshot_etag(base, ())
+
+        self.assertEqual(server_main._snapshot_etag(dict(base), ()), etag)
+        for field, value in (
+            ("greeks_timestamp", "g2"),
+            ("hot_strikes_call", [{"strike": 6000.0, "snapshot_ref": "r2"}]),
+            ("mark_reference_timestamp", "m2"),
+        ):
+            self.assertNotEqual(server_main._snapshot_etag({**base, field: value}, ()), etag, field)
+
+    def test_coalesced_fetches_wait_for_the_call_in_flight(self):
+        cache = {}
+        upstream_calls = []
+
+        def cached_fetch(key):
+            if key in cache:
+                return cache[key]
+            upstream_calls.append(key)
+            time.sleep(0.02)
+            cache[key] = f"chain-{key}"
+            return cache[key]
+
+        async def burst():
+            return await asyncio.gather(
+                *[server_main._run_coalesced(("chain", "SPX"), cached_fetch, "SPX") for _ in range(4)],
+                server_main._run_coalesced(("chain", "NDX"), cached_fetch, "NDX"),
+            )
+
+        results = asyncio.run(burst())
+
+        self.assertEqual(sorted(upstream_calls), ["NDX", "SPX"])
+        self.assertEqual(results, ["chain-SPX"] * 4 + ["chain-NDX"])
+
+
+class CacheStatsTests(unittest.TestCase):
+    def setUp(self):
+        self.orig_build_snapshot = server_main._build_snapshot
+        self.orig_stats = server_main._cache_stats.copy()
+        self.orig_latency = dict(server_main._upstream_latency_ns)
+        self.orig_quotes = dict(server_main._quote_cache_by_symbol)
+        server_main._cache_stats.clear()
+        server_main._upstream_latency_ns.clear()
+        server_main._quote_cache_by_symbol.clear()
+        server_main._snapshot_response_cache.clear()
+        server_main._snapshot_fetch_locks.clear()
+
+    def tearDown(self):
+        server_main._build_snapshot = self.orig_build_snapshot
+        server_main._cache_stats.clear()
+        server_main._cache_stats.update(self.orig_stats)
+        server_main._upstream_latency_ns.clear()
+        server_main._upstream_latency_ns.update(self.orig_latency)
+        server_main._quote_cache_by_symbol.clear()
+        server_main._quote_cache_by_symbol.update(self.orig_quotes)
+        server_main._snapshot_response_cache.clear()
+        server_main._snapshot_fetch_locks.clear()
+
+    def test_coalesced_snapshot_requests_count_one_miss(self):
+        async def fake_build_snapshot(**kwargs):
+            await asyncio.sleep(0.01)
+            return {"symbol": kwargs["symbol"], "expiration": "2026-03-06", "timestamp": "t", "strikes": []}
+
+        server_main._build_snapshot = fake_build_snapshot
+
+        async def burst():
+            return await asyncio.gather(*[server_main._fetch_snapshot(symbol="SPX") for _ in range(4)])
+
+        asyncio.run(burst())
+
+        stats = server_main.get_stats()["cache"]
+        self.assertEqual((stats["snapshot_miss"], stats["snapshot_hit"]), (1, 3))
+
+    def test_quote_lookups_and_upstream_latency_are_reported(self):
+        class FakeClient:
+            def get_quotes(self, instruments):
+                return []
+
+        now_utc = server_main._now_utc()
+        for _ in range(3):
+            server_main._get_quote_snapshot(FakeClient(), now_utc, symbol="SPX", instrument_type=server_main.InstrumentType.INDEX)
+
+        stats = server_main.get_stats()
+        self.assertEqual((stats["cache"]["quote_miss"], stats["cache"]["quote_hit"]), (1, 2))
+        latency = stats["upstream_latency"]["quote"]
+        self.assertEqual(latency["samples"], 1)
+        self.assertLessEqual(latency["p50_ms"], latency["p99_ms"])
+
+
+class SnapshotMissingExpirationsTests(unittest.TestCase):
+    def setUp(self):
+        self.orig_resolve_targets = server_main._resolve_expiration_targets
+        self.orig_get_quote = server_main._get_quote_snapshot
+        self.orig_get_client = server_main._get_public_api_client
+        self.orig_clients = dict(server_main._public_api_clients)
+        self.orig_missing = dict(server_main._missing_expirations_by_symbol)
+        server_main._missing_expirations_by_symbol.clear()
+        server_main._snapshot_response_cache.clear()
+        server_main._snapshot_fetch_locks.clear()
+        server_main._upstream_fetch_locks.clear()
+
+    def tearDown(self):
+        server_main._resolve_expiration_targets = self.orig_resolve_targets
+        server_main._get_quote_snapshot = self.orig_get_quote
+        server_main._get_public_api_client = self.orig_get_client
+        server_main._public_api_clients.clear()
+        server_main._public_api_clients.update(self.orig_clients)
+        server_main._missing_expirations_by_symbol.clear()
+        server_main._missing_expirations_by_symbol.update(self.orig_missing)
+        server_main._snapshot_response_cache.clear()
+        server_main._snapshot_fetch_locks.clear()
+        server_main._upstream_fetch_locks.clear()
+
+    def _install_fakes(self, listings):
+        lookups = []
+        created = []
+
+        def fake_resolve_targets(client, symbol, instrument_type):
+            lookups.append(symbol)
+            return listings.get(symbol)
+
+        def fake_get_client():
+            created.append(True)
+            return object()
+
+        server_main._resolve_expiration_targets = fake_resolve_targets
+        server_main._get_quote_snapshot = lambda *args, **kwargs: {}
+        server_main._get_public_api_client = fake_get_client
+        server_main._public_api_clients[(server_main.get_api_secret(), server_main.get_account_id())] = object()
+        return lookups, created
+
+    def _assert_bad_gateway(self, symbol):
+        with self.assertRaises(server_main.HTTPException) as ctx:
+            asyncio.run(server_main._fetch_snapshot(symbol=symbol))
+        self.assertEqual(ctx.exception.status_code, 502)
+
+    def test_symbol_is_rejected_before_lookup_after_consecutive_empty_listings(self):
+        lookups, created = self._install_fakes({})
+
+        for _ in range(server_main.MISSING_EXPIRATIONS_BLOCK_AFTER + 2):
+            self._assert_bad_gateway("ZZZZ")
+
+        self.assertEqual(lookups, ["ZZZZ"] * server_main.MISSING_EXPIRATIONS_BLOCK_AFTER)
+        self.assertEqual(created, [])
+
+        server_main._missing_expirations_by_symbol["ZZZZ"]["fetched_at"] -= server_main.MISSING_EXPIRATIONS_RETRY_SECONDS
+        self._assert_bad_gateway("ZZZZ")
+        self.assertEqual(len(lookups), server_main.MISSING_EXPIRATIONS_BLOCK_AFTER + 1)
+
+    def test_single_transient_empty_listing_keeps_retrying_upstream(self):
+        listings = {}
+        lookups, _ = self._install_fakes(listings)
+
+        # Empty right after a restart, then listed again: the streak resets.
+        self._assert_bad_gateway("SPX")
+        listings["SPX"] = {"slot_0dte": None}
+        self._assert_bad_gateway("SPX")  # no usable expiration, but the listing itself was not empty
+        self.assertNotIn("SPX", server_main._missing_expirations_by_symbol)
+        del listings["SPX"]
+        self._assert_bad_gateway("SPX")
+        self._assert_bad_gateway("SPX")
+        self.assertEqual(lookups, ["SPX"] * 4)
+
+    def test_missing_symbol_tracking_is_capped(self):
+        self._install_fakes({})
+        for i in range(server_main.MISSING_EXPIRATIONS_MAX_SYMBOLS + 10):
+            self._assert_bad_gateway(f"Z{i}")
+
+        self.assertEqual(len(server_main._missing_expirations_by_symbol), server_main.MISSING_EXPIRATIONS_MAX_SYMBOLS)
+        self.assertNotIn("Z0", server_main._missing_expirations_by_symbol)
+
+
+class PublicApiClientCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.orig_clients = dict(server_main._public_api_clients)
+        self.orig_create = server_main._create_public_api_client
+        self.orig_get_secret = server_main.get_api_secret
+        self.orig_get_account = server_main.get_account_id
+        server_main._public_api_clients.clear()
+        self.created = []
+        self.closed = []
+        self.env = {"secret": "secret-a", "account": "acct-1"}
+
+        test = self
+
+        class FakeClient:
+            def __init__(self, secret, account_id):
+                self.key = (secret, account_id)
+                test.created.append(self.key)
+
+            def close(self):
+                test.closed.append(self.key)
+
+        server_main._create_public_api_client = FakeClient
+        server_main.get_api_secret = lambda: self.env["secret"]
+        server_main.get_account_id = lambda: self.env["account"]
+
+    def tearDown(self):
+        server_main._public_api_clients.clear()
+        server_main._public_api_clients.update(self.orig_clients)
+        server_main._create_public_api_client = self.orig_create
+        server_main.get_api_secret = self.orig_get_secret
+        server_main.get_account_id = self.orig_get_account
+
+    def test_clients_are_reused_per_credentials_and_closed_on_shutdown(self):
+        first = server_main._get_public_api_client()
+        again = server_main._get_public_api_client()
+        self.env["secret"] = "secret-b"
+        rotated = server_main._get_public_api_client()
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, rotated)
+        self.assertEqual(self.created, [("secret-a", "acct-1"), ("secret-b", "acct-1")])
+
+        server_main._close_public_api_clients()
+
+        self.assertEqual(sorted(self.closed), sorted(self.created))
+        self.assertEqual(server_main._public_api_clients, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
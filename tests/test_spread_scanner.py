@@ -0,0 +1,83 @@
+import math
+import unittest
+
+import numpy as np
+
+import web.server.main as server_main
+from web.server.main import _compute_spread_scanner
+
+
+def _row(strike, *, call_bid=None, call_ask=None, put_bid=None, put_ask=None):
+    return {
+        "strike": strike,
+        "call_bid": call_bid,
+        "call_ask": call_ask,
+        "put_bid": put_bid,
+        "put_ask": put_ask,
+        "call_vol": 10,
+        "put_vol": 20,
+        "call_oi": 100,
+        "put_oi": 200,
+    }
+
+
+class SpreadScannerTests(unittest.TestCase):
+    def _chain(self):
+        # Spot used by tests is 450.0.
+        return {
+            440.0: _row(440.0, put_bid=0.40, put_ask=0.50),
+            445.0: _row(445.0, put_bid=0.90, put_ask=1.10),
+            450.0: _row(450.0, put_bid=2.00, put_ask=2.20, call_bid=2.10, call_ask=2.30),
+            455.0: _row(455.0, call_bid=1.00, call_ask=1.20),
+            460.0: _row(460.0, call_bid=0.50, call_ask=0.60),
+            465.0: _row(465.0, call_bid=0.50, call_ask=0.60),
+            470.0: _row(470.0, call_bid=None, call_ask=0.10),
+        }
+
+    def test_adjacent_otm_ladders_sorted_farthest_first(self):
+        result = _compute_spread_scanner(self._chain(), 450.0)
+
+        calls = result["call_credit_spreads"]
+        # 460/465 has zero credit and 465/470 is missing a bid, so both are skipped.
+        self.assertEqual([(row["short_strike"], row["long_strike"]) for row in calls], [(455.0, 460.0)])
+        self.assertEqual(calls[0]["mark_credit"], 0.55)
+        self.assertEqual(calls[0]["bid_credit"], 0.4)
+        self.assertEqual(calls[0]["ask_credit"], 0.7)
+        self.assertEqual(calls[0]["short_volume"], 10)
+
+        puts = result["put_credit_spreads"]
+        self.assertEqual([(row["short_strike"], row["long_strike"]) for row in puts], [(445.0, 440.0)])
+        self.assertEqual(puts[0]["mark_credit"], 0.55)
+        self.assertEqual(puts[0]["distance_from_spx"], 5.0)
+
+    def test_farther_short_strike_sorts_first(self):
+        chain = {
+            455.0: _row(455.0, call_bid=1.00, call_ask=1.20),
+            460.0: _row(460.0, call_bid=0.50, call_ask=0.60),
+            465.0: _row(465.0, call_bid=0.10, call_ask=0.20),
+        }
+        calls = _compute_spread_scanner(chain, 450.0)["call_credit_spreads"]
+        self.assertEqual([row["short_strike"] for row in calls], [460.0, 455.0])
+
+    def test_candidate_kernel_matches_vectorized_mask(self):
+        nan = math.nan
+        short_bid = np.array([1.0, 0.5, nan, 0.2, 0.3])
+        short_ask = np.array([1.2, 0.6, 0.4, 0.3, 0.4])
+        long_bid = np.array([0.5, 0.5, 0.1, 0.1, 0.1])
+        long_ask = np.array([0.6, 0.6, 0.2, nan, 0.2])
+        side_mask = np.array([True, True, True, True, False])
+
+        kernel = server_main._scan_credit_candidates(short_bid, short_ask, long_bid, long_ask, side_mask)
+        mark = (short_bid + short_ask) / 2 - (long_bid + long_ask) / 2
+        self.assertEqual(kernel.tolist(), np.flatnonzero(side_mask & (mark > 0)).tolist())
+        self.assertEqual(kernel.tolist(), [0])
+
+    def test_missing_spot_returns_empty_ladders(self):
+        self.assertEqual(
+            _compute_spread_scanner(self._chain(), None),
+            {"call_credit_spreads": [], "put_credit_spreads": []},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from decimal import Decimal
+from types import SimpleNamespace
+
+import web.server.main as server_main
+
+
+def _chain(strikes):
+    return {strike: {"strike": strike} for strike in strikes}
+
+
+class StrikeWindowTests(unittest.TestCase):
+    def test_nearest_strike_index_breaks_ties_toward_higher_strike(self):
+        strikes = [95.0, 100.0, 105.0]
+        self.assertEqual(server_main._nearest_strike_index(strikes, 102.5), 2)
+        self.assertEqual(server_main._nearest_strike_index(strikes, 102.5, prefer_higher=False), 1)
+        self.assertEqual(server_main._nearest_strike_index(strikes, 101.0), 1)
+
+    def test_nearest_strike_index_clamps_outside_chain(self):
+        strikes = [95.0, 100.0, 105.0]
+        self.assertEqual(server_main._nearest_strike_index(strikes, 10.0), 0)
+        self.assertEqual(server_main._nearest_strike_index(strikes, 500.0), 2)
+
+    def test_windowed_strikes_returns_descending_window_around_atm(self):
+        by_strike = _chain([90.0, 95.0, 100.0, 105.0, 110.0, 115.0])
+        rows = server_main._windowed_strikes(by_strike, 101.0, atm_strikes=1)
+        self.assertEqual([row["strike"] for row in rows], [105.0, 100.0, 95.0])
+
+    def test_windowed_strikes_without_price_returns_full_chain_descending(self):
+        by_strike = _chain([100.0, 90.0, 95.0])
+        rows = server_main._windowed_strikes(by_strike, None, atm_strikes=1)
+        self.assertEqual([row["strike"] for row in rows], [100.0, 95.0, 90.0])
+
+    def test_build_by_strike_merges_legs_into_ascending_rows(self):
+        def option(osi, bid):
+            return SimpleNamespace(
+                instrument=SimpleNamespace(symbol=osi),
+                open_interest=10,
+                volume=5,
+                bid=Decimal(bid),
+                ask=None,
+            )
+
+        calls = [option("SPXW260220C06010000", "1.5"), option("SPXW260220C06000000", "2.5")]
+        puts = [option("SPXW260220P06000000", "3.25")]
+        by_strike = server_main._build_by_strike(calls, puts)
+
+        self.assertEqual(list(by_strike), [6000.0, 6010.0])
+        row = by_strike[6000.0]
+        self.assertEqual(row["call_bid"], 2.5)
+        self.assertEqual(row.get("put_bid"), 3.25)
+        self.assertIsNone(by_strike[6010.0].get("put_osi"))
+        self.assertEqual(list(row.as_dict())[:2], ["strike", "call_oi"])
+        with self.assertRaises(KeyError):
+            row["missing"]
+
+
+if __name__ == "__main__":
+    unittest.main()
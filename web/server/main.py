@@ -3,16 +3,28 @@ FastAPI server for the options-chain dashboard.
 Serves GET /api/snapshot (chain + quote) and static frontend from ../frontend/dist.
 Run from repo root: uvicorn web.server.main:app --reload
 """
+import asyncio
+import bisect
+import hashlib
 import os
 import sys
 import math
 import re
-from collections import deque
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import date, datetime, time, timedelta, timezone
-from decimal import Decimal
 from copy import deepcopy
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from operator import attrgetter, itemgetter
+from time import monotonic, perf_counter_ns, time as epoch_time
+from typing import Annotated, NamedTuple
 from zoneinfo import ZoneInfo
 
+import numpy as np
+
 # Repo root and scripts dir so we can import config and get_option_chain (they use "from config import")
 _REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 _SCRIPTS_DIR = os.path.join(_REPO_ROOT, "scripts")
@@ -20,9 +32,10 @@ for _p in (_SCRIPTS_DIR, _REPO_ROOT):
     if _p not in sys.path:
         sys.path.insert(0, _p)
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 
 # Import after path is set (scripts use "from config import")
 from config import get_api_secret, get_account_id
@@ -50,7 +63,36 @@ try:
 except ImportError:
     create_supabase_client = None
 
-app = FastAPI(title="options-chain API")
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+class OrjsonResponse(JSONResponse):
+    """Default API response: rendered with orjson (C) when installed, stdlib json otherwise."""
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+@asynccontextmanager
+async def _lifespan(_app):
+    yield
+    # Release the shared Public.com clients' HTTP sessions on shutdown.
+    _close_public_api_clients()
+
+
+app = FastAPI(title="options-chain API", lifespan=_lifespan, default_response_class=OrjsonResponse)
+# Snapshot payloads are large, repetitive JSON; compress anything past a small threshold.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 DEFAULT_SYMBOL = "SPX"
 STRADDLE_MONITOR_SYMBOL = "SPX"
@@ -60,7 +102,13 @@ DEFAULT_STRIKE_DEPTH = 25  # default ATM ± N strikes shown in the main table
 MAX_STRIKE_DEPTH = 100
 QUOTE_REFRESH_SECONDS = 10
 CHAIN_REFRESH_SECONDS = 60
+EXPIRATIONS_REFRESH_SECONDS = 5 * 60
+MISSING_EXPIRATIONS_RETRY_SECONDS = 60  # how long a symbol with no listed expirations is rejected without a lookup
+MISSING_EXPIRATIONS_BLOCK_AFTER = 2  # consecutive empty listings before a symbol is rejected without a lookup
+MISSING_EXPIRATIONS_MAX_SYMBOLS = 256
 SNAPSHOT_BUFFER_MAX_AGE_MINUTES = 5
+SNAPSHOT_BUFFER_MAXLEN = 64
+SNAPSHOT_BUFFER_MIN_INTERVAL_SECONDS = 30  # one entry per half minute is plenty for the 5-minute lookback
 HOT_STRIKES_TOP_N = 8
 SKEW_GREEKS_WINDOW_STRIKES = 30
 SKEW_MIN_COVERAGE_WARN_PCT = 60.0
@@ -76,6 +124,11 @@ STRADDLE_MONITOR_HISTORY_DTES = (0, 1)
 STRADDLE_MONITOR_DAILY_CLOSE_SESSIONS = 5
 STRADDLE_CLOSE_CAPTURE_WINDOW_MINUTES = 15
 STRADDLE_MONITOR_RESPONSE_CACHE_SECONDS = 15
+SNAPSHOT_RESPONSE_CACHE_SECONDS = 1.5
+HOT_STRIKES_CACHE_SECONDS = 60
+MAX_SPREAD_TOP_K = 200  # upper bound on the top_k snapshot param, which trims the returned credit-spread lists
+SDK_EXECUTOR_MAX_WORKERS = 8  # a snapshot keeps at most three SDK calls in flight
+UPSTREAM_LATENCY_SAMPLES = 512  # recent upstream call durations kept per call for /api/_stats
 MARKET_TIMEZONE = ZoneInfo("America/New_York")
 MARKET_OPEN_TIME = time(9, 30)
 MARKET_CLOSE_TIME = time(16, 0)
@@ -86,13 +139,26 @@ ATR_SOURCE_SYMBOL_OVERRIDES = {
     "SPX": "^GSPC",
     "NDX": "^NDX",
 }
-_snapshot_buffers = {}  # (symbol, expiration) -> deque[(iso_ts, strikes_slim: [{strike, put_vol, call_vol}])]
-_quote_cache_by_symbol = {}  # symbol -> {fetched_at, quote_snapshot}
-_chain_cache_by_symbol_exp = {}  # (symbol, expiration) -> {fetched_at, by_strike, timestamp}
-_greeks_cache_by_symbol_exp = {}  # (symbol, expiration) -> {fetched_at, by_osi, timestamp}
-_atr_cache_by_symbol = {}  # symbol -> {fetched_at, analysis}
+_snapshot_buffers = {}  # (symbol, expiration) -> deque[VolumeSnapshot]
+_quote_cache_by_symbol = {}  # symbol -> {fetched_at (epoch seconds), quote_snapshot}
+_chain_cache_by_symbol_exp = {}  # (symbol, expiration) -> {fetched_at (epoch seconds), by_strike, timestamp}
+_expiration_dates_cache_by_symbol = {}  # symbol -> {fetched_at (monotonic), dates: sorted list[date]}
+_expiration_targets_cache = {}  # (symbol, date) -> {fetched_at (monotonic), targets}
+_missing_expirations_by_symbol = {}  # symbol -> {fetched_at (monotonic) of the last empty listing, empty_listings}
+_greeks_cache_by_symbol_exp = {}  # (symbol, expiration) -> {fetched_at (epoch seconds), by_osi, timestamp}
+_atr_cache_by_symbol = {}  # symbol -> {fetched_at (epoch seconds), analysis}
 _supabase_client_cache = None
-_straddle_monitor_response_cache = {}  # row_limit -> {fetched_at, payload}
+_cache_stats = Counter()  # "<cache>_hit" / "<cache>_miss" -> lookups since process start
+_cache_stats_lock = threading.Lock()
+_upstream_latency_ns = {}  # upstream call name -> deque of recent durations (perf_counter_ns)
+_public_api_clients = {}  # (secret, account_id) -> PublicApiClient; keeps HTTP sessions warm across requests
+_public_api_client_lock = threading.Lock()
+_sdk_executor = ThreadPoolExecutor(max_workers=SDK_EXECUTOR_MAX_WORKERS, thread_name_prefix="public-sdk")
+_straddle_monitor_response_cache = {}  # row_limit -> {fetched_at (epoch seconds), payload}
+_snapshot_response_cache = {}  # snapshot request key -> {fetched_at (monotonic), payload}
+_snapshot_fetch_locks = {}  # snapshot request key -> asyncio.Lock (single-flight refresh)
+_upstream_fetch_locks = {}  # (kind, symbol, ...) -> asyncio.Lock (one cache-backed SDK fetch in flight per key)
+_hot_strikes_cache = {}  # (symbol, expiration, chain_ts, ref_ts, target_minutes, top_n) -> {fetched_at (monotonic), hot}
 
 
 def _norm_exp(exp):
@@ -130,19 +196,24 @@ def _build_legacy_expiration_targets(normalized_dates: list[date], today: date):
     if not normalized_dates:
         return {"dte0": None, "dte1": None, "friday": None}
 
-    dte0 = next((exp for exp in normalized_dates if exp >= today), normalized_dates[-1])
-    dte1 = next((exp for exp in normalized_dates if exp > today), normalized_dates[-1])
+    # One pass over the ascending dates: first listing on/after today, first after today, first eligible Friday.
     include_today_for_friday = today.weekday() != 4
-    friday = None
+    dte0 = dte1 = friday = None
     for exp in normalized_dates:
-        if exp.weekday() != 4:
+        if exp < today:
             continue
-        if include_today_for_friday and exp >= today:
-            friday = exp
-            break
-        if not include_today_for_friday and exp > today:
+        if dte0 is None:
+            dte0 = exp
+        if dte1 is None and exp > today:
+            dte1 = exp
+        if friday is None and exp.weekday() == 4 and (include_today_for_friday or exp > today):
             friday = exp
+        if dte1 is not None and friday is not None:
             break
+    if dte0 is None:
+        dte0 = normalized_dates[-1]
+    if dte1 is None:
+        dte1 = normalized_dates[-1]
     if friday is None:
         friday = dte1
     return {
@@ -206,25 +277,98 @@ def _match_slot_for_expiration(exp_targets: dict[str, str | None], expiration: s
     return None
 
 
-def _resolve_expiration_targets(client, symbol: str, instrument_type):
-    """Resolve both slot-based and legacy expiration targets used by the UI."""
-    expirations = get_option_expirations(client, symbol, instrument_type=instrument_type)
-    if not expirations:
-        return None
+def _record_cache_lookup(cache_name: str, hit: bool):
+    key = f"{cache_name}_hit" if hit else f"{cache_name}_miss"
+    # Lookups also happen on SDK worker threads, and Counter += is not atomic across them.
+    with _cache_stats_lock:
+        _cache_stats[key] += 1
+
+
+def _timed_upstream(name: str, func, *args, **kwargs):
+    """Call an upstream SDK function, recording its wall time under name."""
+    started = perf_counter_ns()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        samples = _upstream_latency_ns.get(name)
+        if samples is None:
+            samples = _upstream_latency_ns.setdefault(name, deque(maxlen=UPSTREAM_LATENCY_SAMPLES))
+        samples.append(perf_counter_ns() - started)
+
+
+def _get_expiration_dates(client, symbol: str, instrument_type):
+    """Sorted, de-duplicated expiration dates for symbol; listings change at most daily, so cache briefly."""
+    cache_entry = _expiration_dates_cache_by_symbol.get(symbol)
+    if cache_entry and monotonic() - cache_entry["fetched_at"] < EXPIRATIONS_REFRESH_SECONDS:
+        _record_cache_lookup("expirations", hit=True)
+        return cache_entry["dates"]
+    _record_cache_lookup("expirations", hit=False)
+    expirations = _timed_upstream("expirations", get_option_expirations, client, symbol, instrument_type=instrument_type)
     parsed = []
-    for exp in expirations:
-        exp_str = _norm_exp(exp)
+    for exp in expirations or []:
+        # The SDK returns "YYYY-MM-DD" strings; date-like values skip the strftime/fromisoformat round-trip.
+        if isinstance(exp, datetime):
+            parsed.append(exp.date())
+            continue
+        if isinstance(exp, date):
+            parsed.append(exp)
+            continue
         try:
-            parsed.append(date.fromisoformat(exp_str))
+            parsed.append(date.fromisoformat(exp if isinstance(exp, str) else _norm_exp(exp)))
         except ValueError:
             continue
-    if not parsed:
-        return None
     normalized_dates = sorted(set(parsed))
+    if normalized_dates:
+        _expiration_dates_cache_by_symbol[symbol] = {"fetched_at": monotonic(), "dates": normalized_dates}
+    return normalized_dates
+
+
+def _expirations_known_missing(symbol: str) -> bool:
+    entry = _missing_expirations_by_symbol.get(symbol)
+    if entry is None:
+        return False
+    if monotonic() - entry["fetched_at"] >= MISSING_EXPIRATIONS_RETRY_SECONDS:
+        _missing_expirations_by_symbol.pop(symbol, None)
+        return False
+    return entry["empty_listings"] >= MISSING_EXPIRATIONS_BLOCK_AFTER
+
+
+def _record_empty_expirations(symbol: str):
+    """Count an empty listing; a single one is treated as a transient upstream gap."""
+    now = monotonic()
+    entry = _missing_expirations_by_symbol.pop(symbol, None)
+    if entry is None or now - entry["fetched_at"] >= MISSING_EXPIRATIONS_RETRY_SECONDS:
+        empty_listings = 1
+    else:
+        empty_listings = entry["empty_listings"] + 1
+    stale = [
+        key
+        for key, item in _missing_expirations_by_symbol.items()
+        if now - item["fetched_at"] >= MISSING_EXPIRATIONS_RETRY_SECONDS
+    ]
+    for key in stale:
+        del _missing_expirations_by_symbol[key]
+    # Entries are re-inserted on every update, so the first key is the least recently seen.
+    while len(_missing_expirations_by_symbol) >= MISSING_EXPIRATIONS_MAX_SYMBOLS:
+        del _missing_expirations_by_symbol[next(iter(_missing_expirations_by_symbol))]
+    _missing_expirations_by_symbol[symbol] = {"fetched_at": now, "empty_listings": empty_listings}
+
+
+def _resolve_expiration_targets(client, symbol: str, instrument_type):
+    """Resolve both slot-based and legacy expiration targets used by the UI."""
     today = date.today()
+    cache_key = (symbol, today)
+    cache_entry = _expiration_targets_cache.get(cache_key)
+    if cache_entry and monotonic() - cache_entry["fetched_at"] < EXPIRATIONS_REFRESH_SECONDS:
+        return dict(cache_entry["targets"])
+    normalized_dates = _get_expiration_dates(client, symbol, instrument_type)
+    if not normalized_dates:
+        return None
     slot_targets = _build_expiry_slots(normalized_dates, today=today, symbol=symbol)
     legacy_targets = _build_legacy_expiration_targets(normalized_dates, today=today)
-    return {**legacy_targets, **slot_targets}
+    targets = {**legacy_targets, **slot_targets}
+    _expiration_targets_cache[cache_key] = {"fetched_at": monotonic(), "targets": targets}
+    return dict(targets)
 
 
 def _pick_expiration(exp_targets: dict[str, str | None], expiry_mode: str, dte: int):
@@ -299,11 +443,11 @@ def _monitor_expirations_from_dates(normalized_dates: list[date], today: date, s
 def _decimal_float(v):
     if v is None:
         return None
-    if isinstance(v, Decimal):
-        return float(v)
-    if isinstance(v, (int, float)):
+    # float() takes the C fast path for Decimal/int/float (and numpy scalars).
+    try:
         return float(v)
-    return None
+    except (TypeError, ValueError):
+        return None
 
 
 def _mid(bid, ask):
@@ -319,80 +463,124 @@ def _normal_cdf(z: float):
 
 
 def _now_utc():
-    return datetime.utcnow()
+    return datetime.now(timezone.utc)
 
 
 def _iso_utc(ts: datetime):
-    return ts.isoformat() + "Z"
+    return _as_utc(ts).replace(tzinfo=None).isoformat() + "Z"
 
 
-def _prune_buffer(snapshot_buffer: deque, now_utc: datetime):
-    cutoff = now_utc - timedelta(minutes=SNAPSHOT_BUFFER_MAX_AGE_MINUTES)
-    while snapshot_buffer:
-        first_ts = datetime.fromisoformat(snapshot_buffer[0][0].replace("Z", ""))
-        if first_ts < cutoff:
-            snapshot_buffer.popleft()
-        else:
-            break
+class VolumeSnapshot(NamedTuple):
+    """Snapshot buffer entry: chain volume columns (ascending strike) as of one poll."""
+
+    epoch: float
+    timestamp: str
+    strikes: np.ndarray
+    put_vol: np.ndarray
+    call_vol: np.ndarray
+
+
+def _prune_buffer(snapshot_buffer: deque, now_epoch: float):
+    # Entries are appended in time order, so only the stale head needs inspecting.
+    cutoff = now_epoch - SNAPSHOT_BUFFER_MAX_AGE_MINUTES * 60
+    while snapshot_buffer and snapshot_buffer[0][0] < cutoff:
+        snapshot_buffer.popleft()
+
+
+def _record_volume_snapshot(snapshot_buffer: deque, now_epoch: float, ts_iso: str, rows):
+    """Append the chain's volume columns, skipping polls within SNAPSHOT_BUFFER_MIN_INTERVAL_SECONDS of the last entry."""
+    if not snapshot_buffer or now_epoch - snapshot_buffer[-1][0] >= SNAPSHOT_BUFFER_MIN_INTERVAL_SECONDS:
+        snapshot_buffer.append(VolumeSnapshot(now_epoch, ts_iso, *_volume_snapshot(rows)))
+    _prune_buffer(snapshot_buffer, now_epoch)
+
+
+_buffer_entry_epoch = itemgetter(0)
+
+
+def _nearest_buffer_entry(snapshot_buffer: deque, target_epoch: float, exclude_ts: str | None = None):
+    """Entry closest in time to target_epoch (ties go to the older entry), skipping entries stamped exclude_ts."""
+    after = bisect.bisect_left(snapshot_buffer, target_epoch, key=_buffer_entry_epoch)
+    before = after - 1
+    while before >= 0 and snapshot_buffer[before][1] == exclude_ts:
+        before -= 1
+    while after < len(snapshot_buffer) and snapshot_buffer[after][1] == exclude_ts:
+        after += 1
+    if after >= len(snapshot_buffer):
+        return snapshot_buffer[before] if before >= 0 else None
+    if before < 0 or snapshot_buffer[after][0] - target_epoch < target_epoch - snapshot_buffer[before][0]:
+        return snapshot_buffer[after]
+    return snapshot_buffer[before]
+
+
+# SDK option quotes are pydantic models, so these fields are always present (possibly None).
+_option_osi = attrgetter("instrument.symbol")
+_option_quote_fields = attrgetter("open_interest", "volume", "bid", "ask")
+
+
+@dataclass(slots=True)
+class StrikeRow:
+    """One chain strike with both legs; slotted to keep full-chain storage small.
+
+    Supports the read-only dict access (`row["strike"]`, `row.get(...)`) used by the analytics helpers.
+    """
+
+    strike: float
+    call_oi: int | None = None
+    put_oi: int | None = None
+    call_vol: int | None = None
+    put_vol: int | None = None
+    call_bid: float | None = None
+    call_ask: float | None = None
+    put_bid: float | None = None
+    put_ask: float | None = None
+    call_osi: str | None = None
+    put_osi: str | None = None
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def as_dict(self):
+        # Shallow on purpose: dataclasses.asdict would deep-copy every field.
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
 def _build_by_strike(calls, puts):
-    by_strike = {}
-    for opt in calls:
-        osi = opt.instrument.symbol if hasattr(opt, "instrument") else ""
+    """Merge call/put legs into one StrikeRow per strike, ordered by ascending strike."""
+    rows = {}
+    # Chain legs are homogeneous SDK models, so check for an instrument once per side instead of per option.
+    call_legs = calls if calls and hasattr(calls[0], "instrument") else ()
+    put_legs = puts if puts and hasattr(puts[0], "instrument") else ()
+    for opt in call_legs:
+        osi = _option_osi(opt)
         strike = parse_osi_symbol(osi)
         if strike is None:
             continue
-        by_strike.setdefault(
-            strike,
-            {
-                "strike": strike,
-                "call_oi": None,
-                "put_oi": None,
-                "call_vol": None,
-                "put_vol": None,
-                "call_bid": None,
-                "call_ask": None,
-                "put_bid": None,
-                "put_ask": None,
-                "call_osi": None,
-                "put_osi": None,
-            },
-        )
-        by_strike[strike]["call_oi"] = getattr(opt, "open_interest", None)
-        by_strike[strike]["call_vol"] = getattr(opt, "volume", None)
-        by_strike[strike]["call_bid"] = _decimal_float(getattr(opt, "bid", None))
-        by_strike[strike]["call_ask"] = _decimal_float(getattr(opt, "ask", None))
-        by_strike[strike]["call_osi"] = osi
-
-    for opt in puts:
-        osi = opt.instrument.symbol if hasattr(opt, "instrument") else ""
+        row = rows.get(strike)
+        if row is None:
+            row = rows[strike] = StrikeRow(strike)
+        row.call_oi, row.call_vol, bid, ask = _option_quote_fields(opt)
+        row.call_bid = _decimal_float(bid)
+        row.call_ask = _decimal_float(ask)
+        row.call_osi = osi
+    for opt in put_legs:
+        osi = _option_osi(opt)
         strike = parse_osi_symbol(osi)
         if strike is None:
             continue
-        by_strike.setdefault(
-            strike,
-            {
-                "strike": strike,
-                "call_oi": None,
-                "put_oi": None,
-                "call_vol": None,
-                "put_vol": None,
-                "call_bid": None,
-                "call_ask": None,
-                "put_bid": None,
-                "put_ask": None,
-                "call_osi": None,
-                "put_osi": None,
-            },
-        )
-        by_strike[strike]["put_oi"] = getattr(opt, "open_interest", None)
-        by_strike[strike]["put_vol"] = getattr(opt, "volume", None)
-        by_strike[strike]["put_bid"] = _decimal_float(getattr(opt, "bid", None))
-        by_strike[strike]["put_ask"] = _decimal_float(getattr(opt, "ask", None))
-        by_strike[strike]["put_osi"] = osi
-
-    return by_strike
+        row = rows.get(strike)
+        if row is None:
+            row = rows[strike] = StrikeRow(strike)
+        row.put_oi, row.put_vol, bid, ask = _option_quote_fields(opt)
+        row.put_bid = _decimal_float(bid)
+        row.put_ask = _decimal_float(ask)
+        row.put_osi = osi
+    return {strike: rows[strike] for strike in sorted(rows)}
 
 
 def _days_to_expiry(expiration: str):
@@ -415,23 +603,39 @@ def _resolve_strike_depth(strike_depth):
     return min(value, MAX_STRIKE_DEPTH)
 
 
+def _nearest_strike_index(strikes_asc, price, prefer_higher: bool = True):
+    """Index of the strike closest to price in an ascending list; ties go to the higher strike by default."""
+    idx = bisect.bisect_left(strikes_asc, price)
+    if idx == len(strikes_asc):
+        return idx - 1
+    if idx > 0:
+        below_gap = price - strikes_asc[idx - 1]
+        above_gap = strikes_asc[idx] - price
+        if below_gap < above_gap or (below_gap == above_gap and not prefer_higher):
+            return idx - 1
+    return idx
+
+
 def _windowed_strikes(by_strike, spx_price, atm_strikes: int = DEFAULT_STRIKE_DEPTH):
-    strikes_list = sorted(by_strike.keys(), reverse=True)
-    if spx_price is None or not strikes_list:
-        return [by_strike[s] for s in strikes_list]
-    atm_idx = min(range(len(strikes_list)), key=lambda i: abs(strikes_list[i] - spx_price))
+    strikes_asc = sorted(by_strike.keys())
+    if spx_price is None or not strikes_asc:
+        return [by_strike[s] for s in reversed(strikes_asc)]
+    atm_idx = _nearest_strike_index(strikes_asc, spx_price)
     lo = max(0, atm_idx - atm_strikes)
-    hi = min(len(strikes_list), atm_idx + atm_strikes + 1)
-    return [by_strike[s] for s in strikes_list[lo:hi]]
+    hi = min(len(strikes_asc), atm_idx + atm_strikes + 1)
+    # Table is presented highest strike first.
+    return [by_strike[s] for s in reversed(strikes_asc[lo:hi])]
 
 
 def _get_quote_snapshot(client, now_utc: datetime, symbol: str, instrument_type):
     cache_entry = _quote_cache_by_symbol.setdefault(symbol, {"fetched_at": None, "quote_snapshot": None})
     fetched_at = cache_entry.get("fetched_at")
-    if fetched_at is not None and (now_utc - fetched_at).total_seconds() < QUOTE_REFRESH_SECONDS:
+    if fetched_at is not None and epoch_time() - fetched_at < QUOTE_REFRESH_SECONDS:
+        _record_cache_lookup("quote", hit=True)
         cached = cache_entry.get("quote_snapshot") or {}
         return dict(cached)
-    quotes = client.get_quotes([OrderInstrument(symbol=symbol, type=instrument_type)])
+    _record_cache_lookup("quote", hit=False)
+    quotes = _timed_upstream("quote", client.get_quotes, [OrderInstrument(symbol=symbol, type=instrument_type)])
     symbol_price = None
     day_high = None
     day_low = None
@@ -450,7 +654,7 @@ def _get_quote_snapshot(client, now_utc: datetime, symbol: str, instrument_type)
         "close": prev_close,
         "timestamp": ts,
     }
-    cache_entry["fetched_at"] = now_utc
+    cache_entry["fetched_at"] = epoch_time()
     cache_entry["quote_snapshot"] = quote_snapshot
     return dict(quote_snapshot)
 
@@ -462,21 +666,23 @@ def _get_chain_data(client, now_utc: datetime, symbol: str, instrument_type, exp
         fetched_at = cache_entry.get("fetched_at")
         if (
             fetched_at is not None
-            and (now_utc - fetched_at).total_seconds() < CHAIN_REFRESH_SECONDS
+            and epoch_time() - fetched_at < CHAIN_REFRESH_SECONDS
             and cache_entry.get("by_strike")
         ):
+            _record_cache_lookup("chain", hit=True)
             return expiration, cache_entry["by_strike"], cache_entry["timestamp"]
+    _record_cache_lookup("chain", hit=False)
     request = OptionChainRequest(
         instrument=OrderInstrument(symbol=symbol, type=instrument_type),
         expiration_date=expiration,
     )
-    chain = client.get_option_chain(request)
+    chain = _timed_upstream("chain", client.get_option_chain, request)
     calls = getattr(chain, "calls", []) or []
     puts = getattr(chain, "puts", []) or []
     by_strike = _build_by_strike(calls, puts)
     ts = _iso_utc(now_utc)
     _chain_cache_by_symbol_exp[cache_key] = {
-        "fetched_at": now_utc,
+        "fetched_at": epoch_time(),
         "by_strike": by_strike,
         "timestamp": ts,
     }
@@ -760,7 +966,7 @@ def _atr_memory_cache_get(symbol: str, now_utc: datetime, previous_close):
     if not entry:
         return None
     fetched_at = entry.get("fetched_at")
-    if fetched_at is None or (now_utc - fetched_at).total_seconds() > ATR_MEMORY_CACHE_SECONDS:
+    if fetched_at is None or _as_utc(now_utc).timestamp() - fetched_at > ATR_MEMORY_CACHE_SECONDS:
         return None
     analysis = entry.get("analysis")
     if not analysis:
@@ -774,7 +980,7 @@ def _atr_memory_cache_get(symbol: str, now_utc: datetime, previous_close):
 
 def _atr_memory_cache_set(symbol: str, now_utc: datetime, analysis: dict):
     _atr_cache_by_symbol[symbol] = {
-        "fetched_at": now_utc,
+        "fetched_at": _as_utc(now_utc).timestamp(),
         "analysis": deepcopy(analysis),
     }
 
@@ -897,7 +1103,7 @@ def _compute_expected_move(by_strike, spx_price):
     if spx_price is None or not by_strike:
         return None
     strikes = sorted(by_strike.keys())
-    atm_strike = min(strikes, key=lambda s: abs(s - spx_price))
+    atm_strike = strikes[_nearest_strike_index(strikes, spx_price, prefer_higher=False)]
     row = by_strike.get(atm_strike, {})
     call_mid = _mid(row.get("call_bid"), row.get("call_ask"))
     put_mid = _mid(row.get("put_bid"), row.get("put_ask"))
@@ -915,126 +1121,224 @@ def _compute_expected_move(by_strike, spx_price):
     }
 
 
-def _compute_hot_strikes(current_rows, snapshot_buffer: deque, target_minutes=5, top_n=HOT_STRIKES_TOP_N):
+def _volume_snapshot(rows):
+    """Column view (strikes, put_vol, call_vol) of strike rows; missing volume counts as 0."""
+    count = len(rows)
+    strikes = np.fromiter((row["strike"] for row in rows), dtype=np.float64, count=count)
+    put_vol = np.fromiter((row.get("put_vol") or 0 for row in rows), dtype=np.int64, count=count)
+    call_vol = np.fromiter((row.get("call_vol") or 0 for row in rows), dtype=np.int64, count=count)
+    return strikes, put_vol, call_vol
+
+
+def _lookup_volumes(ref_strikes, ref_vol, strikes):
+    """Volume from an ascending reference snapshot at each of strikes (0 where the strike was absent)."""
+    if len(ref_strikes) == 0:
+        return np.zeros(len(strikes), dtype=np.int64)
+    idx = np.minimum(np.searchsorted(ref_strikes, strikes), len(ref_strikes) - 1)
+    return np.where(ref_strikes[idx] == strikes, ref_vol[idx], 0)
+
+
+def _rank_hot_strikes(strikes, vol_now, vol_old, snapshot_ref, top_n):
+    delta = vol_now - vol_old
+    hot_idx = np.flatnonzero(delta > 0)
+    # Stable sort keeps chain order among equal deltas.
+    ranked = hot_idx[np.argsort(-delta[hot_idx], kind="stable")][:top_n]
+    return [
+        {
+            "strike": float(strikes[i]),
+            "current_vol": int(vol_now[i]),
+            "vol_5m_ago": int(vol_old[i]),
+            "delta_5m": int(delta[i]),
+            "snapshot_ref": snapshot_ref,
+        }
+        for i in ranked
+    ]
+
+
+def _compute_hot_strikes(
+    current_rows,
+    snapshot_buffer: deque,
+    target_minutes=5,
+    top_n=HOT_STRIKES_TOP_N,
+    now_epoch: float | None = None,
+    cache_key=None,
+):
+    """
+    Rank strikes by volume added since the buffered snapshot closest to target_minutes ago.
+    cache_key identifies current_rows (e.g. (symbol, expiration, chain_ts)); when given, results for the
+    same rows and reference snapshot are reused for HOT_STRIKES_CACHE_SECONDS.
+    """
     if not snapshot_buffer:
         return [], []
-    now_utc = _now_utc()
-    target = now_utc - timedelta(minutes=target_minutes)
-    candidates = list(snapshot_buffer)
-    best_ts, best_slim = min(
-        candidates,
-        key=lambda item: abs((datetime.fromisoformat(item[0].replace("Z", "")) - target).total_seconds()),
+    if now_epoch is None:
+        now_epoch = _as_utc(_now_utc()).timestamp()
+    target_epoch = now_epoch - target_minutes * 60
+    _, best_ts, ref_strikes, ref_put_vol, ref_call_vol = _nearest_buffer_entry(snapshot_buffer, target_epoch)
+    memo_key = None if cache_key is None else (*cache_key, best_ts, target_minutes, top_n)
+    if memo_key is not None:
+        entry = _hot_strikes_cache.get(memo_key)
+        if entry and monotonic() - entry["fetched_at"] < HOT_STRIKES_CACHE_SECONDS:
+            return entry["hot"]
+    strikes, put_now, call_now = _volume_snapshot(current_rows)
+    call_old = _lookup_volumes(ref_strikes, ref_call_vol, strikes)
+    put_old = _lookup_volumes(ref_strikes, ref_put_vol, strikes)
+    hot_calls = _rank_hot_strikes(strikes, call_now, call_old, best_ts, top_n)
+    hot_puts = _rank_hot_strikes(strikes, put_now, put_old, best_ts, top_n)
+    if memo_key is not None:
+        _hot_strikes_cache_set(memo_key, (hot_calls, hot_puts))
+    return hot_calls, hot_puts
+
+
+def _hot_strikes_cache_set(memo_key, hot):
+    now = monotonic()
+    stale = [key for key, entry in _hot_strikes_cache.items() if now - entry["fetched_at"] >= HOT_STRIKES_CACHE_SECONDS]
+    for key in stale:
+        del _hot_strikes_cache[key]
+    _hot_strikes_cache[memo_key] = {"fetched_at": now, "hot": hot}
+
+
+@dataclass
+class ChainArrays:
+    """Ascending-strike quote columns of a chain (NaN where a quote is missing) for vectorized scans."""
+
+    strikes: np.ndarray
+    call_bid: np.ndarray
+    call_ask: np.ndarray
+    put_bid: np.ndarray
+    put_ask: np.ndarray
+
+
+def _float_or_nan(value):
+    value = _decimal_float(value)
+    return math.nan if value is None else value
+
+
+def _chain_arrays(by_strike, strikes_asc=None):
+    if strikes_asc is None:
+        strikes_asc = sorted(by_strike.keys())
+    rows = [by_strike[s] for s in strikes_asc]
+
+    def column(name):
+        return np.array([_float_or_nan(row.get(name)) for row in rows], dtype=np.float64)
+
+    return ChainArrays(
+        strikes=np.array(strikes_asc, dtype=np.float64),
+        call_bid=column("call_bid"),
+        call_ask=column("call_ask"),
+        put_bid=column("put_bid"),
+        put_ask=column("put_ask"),
     )
-    old_by_strike = {s["strike"]: s for s in best_slim}
-    hot_calls = []
-    hot_puts = []
-    for row in current_rows:
-        strike = row.get("strike")
-        old = old_by_strike.get(strike, {})
-        call_now = row.get("call_vol") or 0
-        put_now = row.get("put_vol") or 0
-        call_old = old.get("call_vol") or 0
-        put_old = old.get("put_vol") or 0
-        delta_call = call_now - call_old
-        delta_put = put_now - put_old
-        if delta_call > 0:
-            hot_calls.append(
-                {
-                    "strike": strike,
-                    "current_vol": call_now,
-                    "vol_5m_ago": call_old,
-                    "delta_5m": delta_call,
-                    "snapshot_ref": best_ts,
-                }
-            )
-        if delta_put > 0:
-            hot_puts.append(
-                {
-                    "strike": strike,
-                    "current_vol": put_now,
-                    "vol_5m_ago": put_old,
-                    "delta_5m": delta_put,
-                    "snapshot_ref": best_ts,
-                }
-            )
-    hot_calls.sort(key=lambda x: x["delta_5m"], reverse=True)
-    hot_puts.sort(key=lambda x: x["delta_5m"], reverse=True)
-    return hot_calls[:top_n], hot_puts[:top_n]
+
+
+_spread_sort_key = itemgetter(0)
+
+
+def _scan_credit_candidates(short_bid, short_ask, long_bid, long_ask, side_mask):
+    """Single-pass numeric kernel over ladder pairs; JIT-compiled when numba is installed."""
+    out = np.empty(short_bid.shape[0], dtype=np.int64)
+    count = 0
+    for i in range(short_bid.shape[0]):
+        if side_mask[i]:
+            mark = (short_bid[i] + short_ask[i]) / 2 - (long_bid[i] + long_ask[i]) / 2
+            if mark > 0:
+                out[count] = i
+                count += 1
+    return out[:count]
+
+
+_scan_credit_candidates_jit = njit(cache=True)(_scan_credit_candidates) if njit is not None else None
+
+
+def _credit_candidate_indices(short_bid, short_ask, long_bid, long_ask, side_mask):
+    # Unrounded mark > 0 is a superset of the rounded mark > 0 check in ranked_spreads; NaN quotes drop out.
+    if _scan_credit_candidates_jit is not None:
+        return _scan_credit_candidates_jit(short_bid, short_ask, long_bid, long_ask, side_mask)
+    mark = (short_bid + short_ask) / 2 - (long_bid + long_ask) / 2
+    return np.flatnonzero(side_mask & (mark > 0))
 
 
 def _compute_spread_scanner(by_strike, spx_price):
+    """Adjacent-ladder OTM credit spreads per side, farthest first, then richer credits."""
     if spx_price is None or not by_strike:
         return {"call_credit_spreads": [], "put_credit_spreads": []}
     strikes = sorted(by_strike.keys())
+    arrays = _chain_arrays(by_strike, strikes)
+    side_arrays = {
+        "call": (arrays.call_bid, arrays.call_ask),
+        "put": (arrays.put_bid, arrays.put_ask),
+    }
 
-    def spread_entry(side, short_strike, long_strike):
-        short_row = by_strike.get(short_strike, {})
-        long_row = by_strike.get(long_strike, {})
-        if side == "call":
-            short_bid = _decimal_float(short_row.get("call_bid"))
-            short_ask = _decimal_float(short_row.get("call_ask"))
-            long_bid = _decimal_float(long_row.get("call_bid"))
-            long_ask = _decimal_float(long_row.get("call_ask"))
-            short_vol = short_row.get("call_vol")
-            long_vol = long_row.get("call_vol")
-            short_oi = short_row.get("call_oi")
-            long_oi = long_row.get("call_oi")
-        else:
-            short_bid = _decimal_float(short_row.get("put_bid"))
-            short_ask = _decimal_float(short_row.get("put_ask"))
-            long_bid = _decimal_float(long_row.get("put_bid"))
-            long_ask = _decimal_float(long_row.get("put_ask"))
-            short_vol = short_row.get("put_vol")
-            long_vol = long_row.get("put_vol")
-            short_oi = short_row.get("put_oi")
-            long_oi = long_row.get("put_oi")
-        if None in (short_bid, short_ask, long_bid, long_ask):
-            return None
-        bid_credit = round(short_bid - long_ask, 2)
-        ask_credit = round(short_ask - long_bid, 2)
-        mark_credit = round(_mid(short_bid, short_ask) - _mid(long_bid, long_ask), 2)
-        # Let frontend control credit-range filtering; keep only sensible positive credits.
-        if mark_credit <= 0:
-            return None
-        return {
-            "side": side,
-            "short_strike": short_strike,
-            "long_strike": long_strike,
-            "width": round(abs(long_strike - short_strike), 2),
-            "distance_from_spx": round(abs(short_strike - spx_price), 2),
-            "bid_credit": bid_credit,
-            "ask_credit": ask_credit,
-            "mark_credit": mark_credit,
-            "short_volume": short_vol,
-            "long_volume": long_vol,
-            "short_oi": short_oi,
-            "long_oi": long_oi,
-        }
-
-    call_spreads = []
-    put_spreads = []
-    for i in range(len(strikes) - 1):
-        lower = strikes[i]
-        higher = strikes[i + 1]
-
-        # Adjacent-ladder call credit: short lower OTM call, long next higher strike.
-        if lower > spx_price:
-            entry = spread_entry("call", lower, higher)
-            if entry:
-                call_spreads.append(entry)
-
-        # Adjacent-ladder put credit: short higher OTM put, long next lower strike.
-        if higher < spx_price:
-            entry = spread_entry("put", higher, lower)
-            if entry:
-                put_spreads.append(entry)
-
-    # "Far OTM" intent: show the farthest spreads first, then richer credits.
-    call_spreads.sort(key=lambda x: (-x["distance_from_spx"], -x["mark_credit"], -x["short_strike"]))
-    put_spreads.sort(key=lambda x: (-x["distance_from_spx"], -x["mark_credit"], -x["short_strike"]))
+    def ranked_spreads(side, short_idx, long_idx):
+        if len(short_idx) == 0:
+            return []
+        bid_col, ask_col = side_arrays[side]
+        bids, asks = bid_col.tolist(), ask_col.tolist()
+        # Strikes and spot are cent-quoted, so one batched round matches round() on each difference.
+        distances = np.round(np.abs(arrays.strikes[short_idx] - spx_price), 2).tolist()
+        keyed = []
+        for s_idx, l_idx, distance in zip(short_idx.tolist(), long_idx.tolist(), distances):
+            # Same 4dp mids as _mid(). Mids land on half cents, where np.round and round() disagree, so stay scalar.
+            mark_credit = round(round((bids[s_idx] + asks[s_idx]) / 2, 4) - round((bids[l_idx] + asks[l_idx]) / 2, 4), 2)
+            # Let frontend control credit-range filtering; keep only sensible positive credits.
+            if mark_credit <= 0:
+                continue
+            keyed.append(((-distance, -mark_credit, -strikes[s_idx]), s_idx, l_idx, mark_credit, distance))
+        # "Far OTM" intent: show the farthest spreads first, then richer credits.
+        keyed.sort(key=_spread_sort_key)
+        if not keyed:
+            return []
+
+        # Survivor columns are rounded in one pass each before the rows are materialized.
+        count = len(keyed)
+        short_sel = np.fromiter((item[1] for item in keyed), dtype=np.int64, count=count)
+        long_sel = np.fromiter((item[2] for item in keyed), dtype=np.int64, count=count)
+        widths = np.round(np.abs(arrays.strikes[long_sel] - arrays.strikes[short_sel]), 2).tolist()
+        bid_credits = np.round(bid_col[short_sel] - ask_col[long_sel], 2).tolist()
+        ask_credits = np.round(ask_col[short_sel] - bid_col[long_sel], 2).tolist()
+        vol_key, oi_key = f"{side}_vol", f"{side}_oi"
+        spreads = []
+        for (_, s_idx, l_idx, mark_credit, distance), width, bid_credit, ask_credit in zip(
+            keyed, widths, bid_credits, ask_credits
+        ):
+            short_row = by_strike[strikes[s_idx]]
+            long_row = by_strike[strikes[l_idx]]
+            spreads.append(
+                {
+                    "side": side,
+                    "short_strike": strikes[s_idx],
+                    "long_strike": strikes[l_idx],
+                    "width": width,
+                    "distance_from_spx": distance,
+                    "bid_credit": bid_credit,
+                    "ask_credit": ask_credit,
+                    "mark_credit": mark_credit,
+                    "short_volume": short_row.get(vol_key),
+                    "long_volume": long_row.get(vol_key),
+                    "short_oi": short_row.get(oi_key),
+                    "long_oi": long_row.get(oi_key),
+                }
+            )
+        return spreads
+
+    # Adjacent-ladder call credit: short lower OTM call, long next higher strike.
+    call_idx = _credit_candidate_indices(
+        arrays.call_bid[:-1],
+        arrays.call_ask[:-1],
+        arrays.call_bid[1:],
+        arrays.call_ask[1:],
+        arrays.strikes[:-1] > spx_price,
+    )
+    # Adjacent-ladder put credit: short higher OTM put, long next lower strike.
+    put_idx = _credit_candidate_indices(
+        arrays.put_bid[1:],
+        arrays.put_ask[1:],
+        arrays.put_bid[:-1],
+        arrays.put_ask[:-1],
+        arrays.strikes[1:] < spx_price,
+    )
     return {
-        "call_credit_spreads": call_spreads,
-        "put_credit_spreads": put_spreads,
+        "call_credit_spreads": ranked_spreads("call", call_idx, call_idx + 1),
+        "put_credit_spreads": ranked_spreads("put", put_idx + 1, put_idx),
     }
 
 
@@ -1230,16 +1534,18 @@ def _get_option_greeks_map(client, now_utc: datetime, symbol: str, expiration: s
         fetched_at = cache_entry.get("fetched_at")
         if (
             fetched_at is not None
-            and (now_utc - fetched_at).total_seconds() < CHAIN_REFRESH_SECONDS
+            and epoch_time() - fetched_at < CHAIN_REFRESH_SECONDS
             and all(sym in cached_by_osi for sym in symbols)
         ):
+            _record_cache_lookup("greeks", hit=True)
             return {sym: cached_by_osi.get(sym, {}) for sym in symbols}
+    _record_cache_lookup("greeks", hit=False)
 
     by_osi = dict(cached_by_osi)
     successful_fetch = False
     for chunk in _chunk_symbols(symbols, GREEKS_FETCH_CHUNK_SIZE):
         try:
-            response = client.get_option_greeks(osi_symbols=chunk)
+            response = _timed_upstream("greeks", client.get_option_greeks, osi_symbols=chunk)
         except Exception:
             continue
         successful_fetch = True
@@ -1247,7 +1553,7 @@ def _get_option_greeks_map(client, now_utc: datetime, symbol: str, expiration: s
 
     if successful_fetch:
         _greeks_cache_by_symbol_exp[cache_key] = {
-            "fetched_at": now_utc,
+            "fetched_at": epoch_time(),
             "by_osi": by_osi,
             "timestamp": _iso_utc(now_utc),
         }
@@ -1266,7 +1572,7 @@ def _select_skew_osi_symbols(
     if spot is None:
         atm_idx = len(strikes) // 2
     else:
-        atm_idx = min(range(len(strikes)), key=lambda i: abs(strikes[i] - spot))
+        atm_idx = _nearest_strike_index(strikes, spot, prefer_higher=False)
     depth = max(1, int(window_strikes))
     lo = max(0, atm_idx - depth)
     hi = min(len(strikes), atm_idx + depth + 1)
@@ -1406,7 +1712,7 @@ def _compute_skew_analysis(
     call_25d = _select_delta_node(call_candidates, 0.25, spot, "call")
     call_10d = _select_delta_node(call_candidates, 0.10, spot, "call")
 
-    atm_strike = min(strikes_list, key=lambda s: abs(s - spot)) if strikes_list else None
+    atm_strike = strikes_list[_nearest_strike_index(strikes_list, spot, prefer_higher=False)] if strikes_list else None
     atm_50d = _skew_node_payload()
     if atm_strike is not None:
         atm_row = by_strike.get(atm_strike, {})
@@ -1528,19 +1834,9 @@ def _compute_skew_analysis(
 
 
 def _resolve_monitor_expirations(client, symbol: str, instrument_type, row_limit: int):
-    expirations = get_option_expirations(client, symbol, instrument_type=instrument_type)
-    if not expirations:
-        return []
-    parsed = []
-    for exp in expirations:
-        exp_str = _norm_exp(exp)
-        try:
-            parsed.append(date.fromisoformat(exp_str))
-        except ValueError:
-            continue
-    if not parsed:
+    normalized_dates = _get_expiration_dates(client, symbol, instrument_type)
+    if not normalized_dates:
         return []
-    normalized_dates = sorted(set(parsed))
     return _monitor_expirations_from_dates(
         normalized_dates=normalized_dates,
         today=date.today(),
@@ -1556,7 +1852,7 @@ def _select_nearest_strike_row(by_strike, symbol_price):
     if symbol_price is None:
         strike = strikes_list[len(strikes_list) // 2]
     else:
-        strike = min(strikes_list, key=lambda s: abs(s - symbol_price))
+        strike = strikes_list[_nearest_strike_index(strikes_list, symbol_price, prefer_higher=False)]
     return strike, by_strike.get(strike, {})
 
 
@@ -1729,7 +2025,7 @@ def _straddle_monitor_cache_get(row_limit: int, now_utc: datetime):
     fetched_at = entry.get("fetched_at")
     if fetched_at is None:
         return None
-    if (now_utc - fetched_at).total_seconds() > STRADDLE_MONITOR_RESPONSE_CACHE_SECONDS:
+    if _as_utc(now_utc).timestamp() - fetched_at > STRADDLE_MONITOR_RESPONSE_CACHE_SECONDS:
         return None
     payload = entry.get("payload")
     if not payload:
@@ -1739,14 +2035,15 @@ def _straddle_monitor_cache_get(row_limit: int, now_utc: datetime):
 
 def _straddle_monitor_cache_set(row_limit: int, now_utc: datetime, payload: dict):
     _straddle_monitor_response_cache[row_limit] = {
-        "fetched_at": now_utc,
+        "fetched_at": _as_utc(now_utc).timestamp(),
         "payload": deepcopy(payload),
     }
 
 
-def _create_public_api_client():
-    secret = get_api_secret()
-    account_id = get_account_id()
+def _create_public_api_client(secret=None, account_id=None):
+    if secret is None:
+        secret = get_api_secret()
+        account_id = get_account_id()
     if not secret:
         raise RuntimeError("PUBLIC_COM_SECRET not set")
     if PublicApiClient is None:
@@ -1758,6 +2055,32 @@ def _create_public_api_client():
     )
 
 
+def _cached_public_api_client():
+    """The shared client for the configured credentials if one exists; never does I/O."""
+    return _public_api_clients.get((get_api_secret(), get_account_id()))
+
+
+def _get_public_api_client():
+    """Return the shared PublicApiClient for the configured credentials, creating it on first use."""
+    client = _cached_public_api_client()
+    if client is not None:
+        return client
+    key = (get_api_secret(), get_account_id())
+    with _public_api_client_lock:
+        client = _public_api_clients.get(key)
+        if client is None:
+            client = _public_api_clients[key] = _create_public_api_client(*key)
+    return client
+
+
+def _close_public_api_clients():
+    with _public_api_client_lock:
+        clients = list(_public_api_clients.values())
+        _public_api_clients.clear()
+    for client in clients:
+        client.close()
+
+
 def _build_straddle_monitor_snapshot(client, now_utc: datetime, row_limit: int):
     spx_quote = _get_quote_snapshot(client, now_utc, symbol=STRADDLE_MONITOR_SYMBOL, instrument_type=InstrumentType.INDEX)
     vix_quote = _get_quote_snapshot(client, now_utc, symbol="VIX", instrument_type=InstrumentType.INDEX)
@@ -1839,37 +2162,34 @@ def _fetch_straddle_monitor(row_limit=None):
     if cached is not None:
         return cached
     try:
-        client = _create_public_api_client()
+        client = _get_public_api_client()
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc))
-    try:
-        snapshot = _build_straddle_monitor_snapshot(client=client, now_utc=now_utc, row_limit=row_limit)
+    snapshot = _build_straddle_monitor_snapshot(client=client, now_utc=now_utc, row_limit=row_limit)
 
-        if _is_regular_market_hours(now_utc):
-            _supabase_upsert_straddle_history_rows(snapshot.pop("history_writes", []))
-        else:
-            snapshot.pop("history_writes", None)
+    if _is_regular_market_hours(now_utc):
+        _supabase_upsert_straddle_history_rows(snapshot.pop("history_writes", []))
+    else:
+        snapshot.pop("history_writes", None)
 
-        session_start_utc, _ = _market_session_bounds(now_utc)
-        history_rows = _supabase_get_straddle_history_rows(
-            symbol=STRADDLE_MONITOR_SYMBOL,
-            session_start_iso=session_start_utc.isoformat(),
-        )
-        close_rows = _supabase_get_straddle_daily_close_rows(
-            symbol=STRADDLE_MONITOR_SYMBOL,
-            row_limit=STRADDLE_MONITOR_DAILY_CLOSE_SESSIONS * STRADDLE_MONITOR_MAX_ROWS,
-        )
-        payload = {
-            **snapshot,
-            "history": _shape_straddle_history(history_rows),
-            "daily_closes": _shape_straddle_daily_close_history(close_rows),
-            "history_resolution_seconds": 60,
-            "daily_close_capture_time": "16:00 ET",
-        }
-        _straddle_monitor_cache_set(row_limit=row_limit, now_utc=now_utc, payload=payload)
-        return payload
-    finally:
-        client.close()
+    session_start_utc, _ = _market_session_bounds(now_utc)
+    history_rows = _supabase_get_straddle_history_rows(
+        symbol=STRADDLE_MONITOR_SYMBOL,
+        session_start_iso=session_start_utc.isoformat(),
+    )
+    close_rows = _supabase_get_straddle_daily_close_rows(
+        symbol=STRADDLE_MONITOR_SYMBOL,
+        row_limit=STRADDLE_MONITOR_DAILY_CLOSE_SESSIONS * STRADDLE_MONITOR_MAX_ROWS,
+    )
+    payload = {
+        **snapshot,
+        "history": _shape_straddle_history(history_rows),
+        "daily_closes": _shape_straddle_daily_close_history(close_rows),
+        "history_resolution_seconds": 60,
+        "daily_close_capture_time": "16:00 ET",
+    }
+    _straddle_monitor_cache_set(row_limit=row_limit, now_utc=now_utc, payload=payload)
+    return payload
 
 
 def _capture_straddle_daily_close_snapshot(row_limit=None, now_utc: datetime | None = None, force: bool = False):
@@ -2017,6 +2337,7 @@ def _collect_spread_osi_symbols(spread_scanner, by_strike):
     return sorted({s for s in symbols if s})
 
 
+@lru_cache(maxsize=1)
 def _resolve_account_id(secret: str, account_id: str | None) -> str:
     """Resolve account id from env, or auto-discover the first account."""
     if account_id:
@@ -2039,7 +2360,59 @@ def _resolve_account_id(secret: str, account_id: str | None) -> str:
         discover_client.close()
 
 
-def _fetch_snapshot(
+async def _run_blocking(func, *args, **kwargs):
+    """Run a blocking SDK call on the shared SDK worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_sdk_executor, partial(func, *args, **kwargs))
+
+
+async def _run_coalesced(key, func, *args, **kwargs):
+    """
+    Run a cache-backed blocking fetch with at most one call per key in flight.
+    Concurrent snapshots that differ only in window/flags wait and then read the cache the first call filled.
+    """
+    lock = _upstream_fetch_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            return await _run_blocking(func, *args, **kwargs)
+    finally:
+        _discard_idle_lock(_upstream_fetch_locks, key, lock)
+
+
+def _discard_idle_lock(locks: dict, key, lock: asyncio.Lock):
+    # Waiters already hold the lock object and re-read the cache, so the entry can go once it is released.
+    if locks.get(key) is lock and not lock.locked():
+        del locks[key]
+
+
+def _copy_snapshot_payload(payload: dict):
+    # Strike rows are shared with the chain cache and get per-request delta fields attached.
+    copied = dict(payload)
+    copied["strikes"] = [dict(row) for row in payload.get("strikes", [])]
+    return copied
+
+
+def _snapshot_cache_get(cache_key):
+    entry = _snapshot_response_cache.get(cache_key)
+    if not entry or monotonic() - entry["fetched_at"] >= SNAPSHOT_RESPONSE_CACHE_SECONDS:
+        return None
+    return _copy_snapshot_payload(entry["payload"])
+
+
+def _snapshot_cache_set(cache_key, payload: dict):
+    now = monotonic()
+    stale = [
+        key for key, entry in _snapshot_response_cache.items() if now - entry["fetched_at"] >= SNAPSHOT_RESPONSE_CACHE_SECONDS
+    ]
+    for key in stale:
+        del _snapshot_response_cache[key]
+    _snapshot_response_cache[cache_key] = {
+        "fetched_at": now,
+        "payload": payload,
+    }
+
+
+async def _fetch_snapshot(
     symbol: str = DEFAULT_SYMBOL,
     dte: int = 0,
     expiry_mode: str = "dte",
@@ -2047,6 +2420,8 @@ def _fetch_snapshot(
     strike_depth=None,
     include_atr: bool = False,
     include_skew: bool = False,
+    top_k: int | None = None,
+    mark_last_min: int | None = None,
 ):
     expiry_mode = expiry_mode.lower()
     if expiry_slot is None:
@@ -2058,29 +2433,126 @@ def _fetch_snapshot(
                 detail=f"Unsupported expiry_mode={expiry_mode}; expected one of {sorted(SUPPORTED_EXPIRY_MODES)}",
             )
     expiry_slot_requested = _resolve_requested_expiry_slot(expiry_slot=expiry_slot, expiry_mode=expiry_mode, dte=dte)
-
     symbol = _normalize_symbol(symbol)
-    secret = get_api_secret()
-    account_id = get_account_id()
-    if not secret:
-        raise HTTPException(status_code=500, detail="PUBLIC_COM_SECRET not set")
-    if PublicApiClient is None:
-        raise HTTPException(status_code=500, detail="publicdotcom-py not installed")
-    account_id = _resolve_account_id(secret=secret, account_id=account_id)
+    if _expirations_known_missing(symbol):
+        raise HTTPException(status_code=502, detail=f"No {symbol} expirations")
+    strike_window_size = _resolve_strike_depth(strike_depth)
+    if top_k is not None and top_k < 1:
+        raise HTTPException(status_code=400, detail=f"Unsupported top_k={top_k}; expected 1..{MAX_SPREAD_TOP_K}")
+    spread_top_k = min(top_k, MAX_SPREAD_TOP_K) if top_k is not None else None
+
+    # Coalesce bursts: serve a very recent payload, and let only one request per key refresh it.
+    # dte/expiry_mode are only validated (and only used) when no slot is requested.
+    expiry_key = ("slot", expiry_slot_requested) if expiry_slot is not None else ("dte", dte, expiry_mode)
+    cache_key = (
+        symbol,
+        expiry_key,
+        strike_window_size,
+        bool(include_atr),
+        bool(include_skew),
+        spread_top_k,
+    )
+    result = _snapshot_cache_get(cache_key)
+    built = False
+    if result is None:
+        lock = _snapshot_fetch_locks.setdefault(cache_key, asyncio.Lock())
+        try:
+            async with lock:
+                result = _snapshot_cache_get(cache_key)
+                if result is None:
+                    built = True
+                    payload = await _build_snapshot(
+                        symbol=symbol,
+                        dte=dte,
+                        expiry_mode=expiry_mode,
+                        expiry_slot=expiry_slot,
+                        expiry_slot_requested=expiry_slot_requested,
+                        strike_window_size=strike_window_size,
+                        include_atr=include_atr,
+                        include_skew=include_skew,
+                        spread_top_k=spread_top_k,
+                    )
+                    _snapshot_cache_set(cache_key, payload)
+                    result = _copy_snapshot_payload(payload)
+        finally:
+            _discard_idle_lock(_snapshot_fetch_locks, cache_key, lock)
+    # Requests that waited on another request's build count as hits.
+    _record_cache_lookup("snapshot", hit=not built)
+    if mark_last_min is not None and mark_last_min > 0:
+        _attach_mark_deltas(result, mark_last_min)
+    return result
+
+
+def _attach_mark_deltas(result: dict, mark_last_min: int):
+    """Annotate the (per-request copy of) window rows with volume added since ~mark_last_min ago."""
+    result["mark_reference_timestamp"] = None
+    snapshot_buffer = _snapshot_buffers.get((result["symbol"], result["expiration"]))
+    if not snapshot_buffer:
+        return
+    target_epoch = _as_utc(_now_utc()).timestamp() - mark_last_min * 60
+    # Same reference lookup as the hot strikes, minus the entry this payload itself recorded.
+    reference = _nearest_buffer_entry(snapshot_buffer, target_epoch, exclude_ts=result["timestamp"])
+    rows = result["strikes"]
+    if reference is None:
+        for s in rows:
+            s["delta_put"] = None
+            s["delta_call"] = None
+        return
+    _, ref_ts, ref_strikes, ref_put_vol, ref_call_vol = reference
+    result["mark_reference_timestamp"] = ref_ts
+    strikes, put_vol, call_vol = _volume_snapshot(rows)
+    delta_put = (put_vol - _lookup_volumes(ref_strikes, ref_put_vol, strikes)).tolist()
+    delta_call = (call_vol - _lookup_volumes(ref_strikes, ref_call_vol, strikes)).tolist()
+    for s, d_put, d_call in zip(rows, delta_put, delta_call):
+        s["delta_put"] = d_put
+        s["delta_call"] = d_call
+
+
+async def _build_snapshot(
+    symbol: str,
+    dte: int,
+    expiry_mode: str,
+    expiry_slot: str | None,
+    expiry_slot_requested: str,
+    strike_window_size: int,
+    include_atr: bool,
+    include_skew: bool,
+    spread_top_k: int | None = None,
+):
+    # Only creating the client can block (account discovery), so skip the pool hop once it exists.
+    client = _cached_public_api_client()
+    if client is None:
+        try:
+            client = await _run_blocking(_get_public_api_client)
+        except RuntimeError as exc:
+            raise HTTPException(status_code=500, detail=str(exc))
     instrument_type = _instrument_type_for_symbol(symbol)
 
-    client = PublicApiClient(
-        ApiKeyAuthConfig(api_secret_key=secret),
-        config=PublicApiClientConfiguration(default_account_number=account_id),
-    )
+    quote_task = chain_task = atr_task = None
     try:
         now_utc = _now_utc()
-        quote_snapshot = _get_quote_snapshot(client, now_utc, symbol=symbol, instrument_type=instrument_type)
-        symbol_price = _decimal_float(quote_snapshot.get("last"))
-        quote_ts = quote_snapshot.get("timestamp")
-        exp_targets = _resolve_expiration_targets(client, symbol=symbol, instrument_type=instrument_type)
+        # Quote and expirations are independent round-trips; only the chain waits on the expiration.
+        quote_task = asyncio.create_task(
+            _run_coalesced(
+                ("quote", symbol),
+                _get_quote_snapshot,
+                client,
+                now_utc,
+                symbol=symbol,
+                instrument_type=instrument_type,
+            )
+        )
+        exp_targets = await _run_coalesced(
+            ("expirations", symbol),
+            _resolve_expiration_targets,
+            client,
+            symbol=symbol,
+            instrument_type=instrument_type,
+        )
         if not exp_targets:
+            _record_empty_expirations(symbol)
             raise HTTPException(status_code=502, detail=f"No {symbol} expirations")
+        _missing_expirations_by_symbol.pop(symbol, None)
         if expiry_slot is not None:
             expiry_slot_resolved, expiration = _resolve_expiration_for_slot(exp_targets, requested_slot=expiry_slot_requested)
         else:
@@ -2093,33 +2565,53 @@ def _fetch_snapshot(
                 detail=f"No usable expiration for {symbol}; requested_slot={expiry_slot_requested}",
             )
 
-        expiration, by_strike, chain_ts = _get_chain_data(
-            client,
-            now_utc,
-            symbol=symbol,
-            instrument_type=instrument_type,
-            expiration=expiration,
+        # Start the chain before waiting on the quote so the two round-trips overlap.
+        chain_task = asyncio.create_task(
+            _run_coalesced(
+                ("chain", symbol, expiration),
+                _get_chain_data,
+                client,
+                now_utc,
+                symbol=symbol,
+                instrument_type=instrument_type,
+                expiration=expiration,
+            )
         )
+        quote_snapshot = await quote_task
+        symbol_price = _decimal_float(quote_snapshot.get("last"))
+        quote_ts = quote_snapshot.get("timestamp")
+        if include_atr:
+            # ATR only needs the quote, so its history/Supabase lookups overlap the chain and greeks fetches.
+            atr_task = asyncio.create_task(
+                _run_blocking(_compute_atr_analysis, symbol=symbol, quote_snapshot=quote_snapshot, now_utc=now_utc)
+            )
+        expiration, by_strike, chain_ts = await chain_task
         days_to_expiry = _days_to_expiry(expiration)
-        strike_window_size = _resolve_strike_depth(strike_depth)
-        strikes = _windowed_strikes(by_strike, symbol_price, atm_strikes=strike_window_size)
+        strikes = [row.as_dict() for row in _windowed_strikes(by_strike, symbol_price, atm_strikes=strike_window_size)]
         ts_iso = _iso_utc(now_utc)
 
-        # Append full-chain slim snapshot for analytics.
+        # Append full-chain volume columns for analytics.
         full_rows = [by_strike[s] for s in sorted(by_strike.keys())]
-        slim = [{"strike": s["strike"], "put_vol": s.get("put_vol"), "call_vol": s.get("call_vol")} for s in full_rows]
-        snapshot_buffer = _snapshot_buffers.setdefault((symbol, expiration), deque(maxlen=512))
-        snapshot_buffer.append((ts_iso, slim))
-        _prune_buffer(snapshot_buffer, now_utc)
+        snapshot_buffer = _snapshot_buffers.setdefault((symbol, expiration), deque(maxlen=SNAPSHOT_BUFFER_MAXLEN))
+        now_epoch = _as_utc(now_utc).timestamp()
+        _record_volume_snapshot(snapshot_buffer, now_epoch, ts_iso, full_rows)
 
         em = _compute_expected_move(by_strike, symbol_price) or {}
         hot_calls, hot_puts = _compute_hot_strikes(
-            full_rows, snapshot_buffer=snapshot_buffer, target_minutes=5, top_n=HOT_STRIKES_TOP_N
+            full_rows,
+            snapshot_buffer=snapshot_buffer,
+            target_minutes=5,
+            top_n=HOT_STRIKES_TOP_N,
+            now_epoch=now_epoch,
+            cache_key=(symbol, expiration, chain_ts),
         )
+        # ATR targets and POP read the full ladder; spread_top_k only trims what is returned.
         spread_scanner = _compute_spread_scanner(by_strike, symbol_price)
         spread_scanner.update(_compute_bwb_scanner(by_strike, symbol_price, {}))
         spread_osi_symbols = _collect_spread_osi_symbols(spread_scanner, by_strike)
-        greeks_by_osi = _get_option_greeks_map(
+        greeks_by_osi = await _run_coalesced(
+            ("greeks", symbol, expiration),
+            _get_option_greeks_map,
             client,
             now_utc,
             symbol=symbol,
@@ -2157,7 +2649,7 @@ def _fetch_snapshot(
         atr_analysis = None
         atr_target_spreads = {}
         if include_atr:
-            atr_analysis = _compute_atr_analysis(symbol=symbol, quote_snapshot=quote_snapshot, now_utc=now_utc)
+            atr_analysis = await atr_task
             atr_target_spreads = {
                 "call_plus_1atr": None,
                 "put_minus_1atr": None,
@@ -2182,6 +2674,10 @@ def _fetch_snapshot(
                     atr_analysis.get("minus_2atr_level"),
                 )
 
+        if spread_top_k is not None:
+            for key in ("call_credit_spreads", "put_credit_spreads"):
+                spread_scanner[key] = spread_scanner[key][:spread_top_k]
+
         skew_analysis = None
         if include_skew:
             skew_osi_symbols = _select_skew_osi_symbols(
@@ -2189,7 +2685,9 @@ def _fetch_snapshot(
                 symbol_price,
                 window_strikes=SKEW_GREEKS_WINDOW_STRIKES,
             )
-            skew_greeks_by_osi = _get_option_greeks_map(
+            skew_greeks_by_osi = await _run_coalesced(
+                ("greeks", symbol, expiration),
+                _get_option_greeks_map,
                 client,
                 now_utc,
                 symbol=symbol,
@@ -2221,6 +2719,7 @@ def _fetch_snapshot(
             "timestamp": ts_iso,
             "quote_timestamp": quote_ts,
             "chain_timestamp": chain_ts,
+            "greeks_timestamp": (_greeks_cache_by_symbol_exp.get((symbol, expiration)) or {}).get("timestamp"),
             "quote_refresh_seconds": QUOTE_REFRESH_SECONDS,
             "chain_refresh_seconds": CHAIN_REFRESH_SECONDS,
             "strikes": strikes,
@@ -2233,11 +2732,40 @@ def _fetch_snapshot(
             "skew_analysis": skew_analysis,
         }
     finally:
-        client.close()
+        for task in (quote_task, chain_task, atr_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+def _snapshot_etag(result: dict, request_key) -> str:
+    # Rebuilt payloads only differ in their build timestamp until one of these inputs changes.
+    hot_rows = (result.get("hot_strikes_call") or []) + (result.get("hot_strikes_put") or [])
+    fingerprint = "|".join(
+        str(part)
+        for part in (
+            result.get("symbol"),
+            result.get("chain_timestamp"),
+            result.get("quote_timestamp"),
+            result.get("greeks_timestamp"),
+            hot_rows[0].get("snapshot_ref") if hot_rows else None,
+            result.get("mark_reference_timestamp"),
+            *request_key,
+        )
+    )
+    return '"' + hashlib.blake2b(fingerprint.encode(), digest_size=8).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
 
 
 @app.get("/api/snapshot")
-def get_snapshot(
+async def get_snapshot(
+    request: Request = None,
+    response: Response = None,
     mark_last_min: int | None = None,
     dte: int = 0,
     symbol: str = DEFAULT_SYMBOL,
@@ -2246,8 +2774,9 @@ def get_snapshot(
     strike_depth: str | None = None,
     include_atr: bool = False,
     include_skew: bool = False,
+    top_k: Annotated[int | None, Query(ge=1, le=MAX_SPREAD_TOP_K)] = None,
 ):
-    result = _fetch_snapshot(
+    result = await _fetch_snapshot(
         symbol=symbol,
         dte=dte,
         expiry_mode=expiry_mode,
@@ -2255,28 +2784,21 @@ def get_snapshot(
         strike_depth=strike_depth,
         include_atr=include_atr,
         include_skew=include_skew,
+        top_k=top_k,
+        mark_last_min=mark_last_min,
     )
-    snapshot_buffer = _snapshot_buffers.setdefault((result["symbol"], result["expiration"]), deque(maxlen=512))
-    if mark_last_min is not None and mark_last_min > 0 and snapshot_buffer:
-        now_utc = datetime.utcnow()
-        target = now_utc - timedelta(minutes=mark_last_min)
-        candidates = [(ts_iso, slim) for (ts_iso, slim) in snapshot_buffer if ts_iso != result["timestamp"]]
-        if not candidates:
-            for s in result["strikes"]:
-                s["delta_put"] = None
-                s["delta_call"] = None
-        else:
-            def _dist(item):
-                ts_iso, _ = item
-                ts_dt = datetime.fromisoformat(ts_iso.replace("Z", ""))
-                return abs((ts_dt - target).total_seconds())
-            best = min(candidates, key=_dist)
-            old_slim = best[1]
-            old_by_strike = {s["strike"]: s for s in old_slim}
-            for s in result["strikes"]:
-                old = old_by_strike.get(s["strike"], {})
-                s["delta_put"] = (s.get("put_vol") or 0) - (old.get("put_vol") or 0)
-                s["delta_call"] = (s.get("call_vol") or 0) - (old.get("call_vol") or 0)
+    if request is None or response is None:
+        # Called directly rather than routed; there are no HTTP headers to negotiate.
+        return result
+    etag = _snapshot_etag(
+        result,
+        (result.get("expiration"), dte, expiry_mode, expiry_slot, strike_depth, include_atr, include_skew, top_k, mark_last_min),
+    )
+    # Revalidate every poll: the dashboard polls at QUOTE_REFRESH_SECONDS, so any max-age can serve a stale view.
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
     return result
 
 
@@ -2285,6 +2807,27 @@ def get_straddle_monitor(rows: int | None = None):
     return _fetch_straddle_monitor(row_limit=rows)
 
 
+def _latency_summary(samples_ns):
+    samples = np.fromiter(samples_ns, dtype=np.int64)
+    if samples.size == 0:
+        return {"samples": 0, "p50_ms": None, "p99_ms": None}
+    p50, p99 = np.percentile(samples, [50, 99]) / 1e6
+    return {"samples": int(samples.size), "p50_ms": round(float(p50), 3), "p99_ms": round(float(p99), 3)}
+
+
+@app.get("/api/_stats")
+def get_stats():
+    with _cache_stats_lock:
+        cache = dict(_cache_stats)
+    return {
+        "cache": cache,
+        "snapshot_buffers": {
+            f"{symbol}:{expiration}": len(buffer) for (symbol, expiration), buffer in list(_snapshot_buffers.items())
+        },
+        "upstream_latency": {name: _latency_summary(list(samples)) for name, samples in list(_upstream_latency_ns.items())},
+    }
+
+
 # Serve static frontend if built
 _dist = os.path.join(os.path.dirname(__file__), "..", "frontend", "dist")
 if os.path.isdir(_dist):